@@ -0,0 +1,62 @@
+"""Pages per second for each HTML parser backend (full and partial parsing) on saved Screener pages.
+
+Fixtures are either ``*.html`` files or a recording directory made with
+``FINOVA_RECORD_DIR`` (only Screener company pages are used)::
+
+    python benchmarks/bench_parsers.py --dir recordings --rounds 5
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.htmlparse import available_backends
+from common.screener import parse_screener_html
+
+
+def load_fixtures(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, "rb") as f:
+            pages.append(f.read())
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if "screener.in/company/" in meta.get("url", "") and meta.get("status") == 200:
+            with open(path[:-5] + ".body", "rb") as f:
+                pages.append(f.read())
+    return pages
+
+
+def bench(pages, backend, rounds, partial):
+    parse_screener_html(pages[0], backend=backend, partial=partial)  # warm-up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for page in pages:
+            parse_screener_html(page, backend=backend, partial=partial)
+    return rounds * len(pages) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", default=os.environ.get("FINOVA_RECORD_DIR", "recordings"))
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_fixtures(args.dir)
+    if not pages:
+        sys.exit(f"No Screener fixtures found in {args.dir}")
+
+    size_kb = sum(len(p) for p in pages) / len(pages) / 1024
+    print(f"{len(pages)} pages, {size_kb:.0f} KB average")
+    baseline = None
+    for backend in reversed(available_backends()):
+        # partial parsing only changes the BeautifulSoup backends
+        for partial in ((False,) if backend == "selectolax" else (False, True)):
+            rate = bench(pages, backend, args.rounds, partial)
+            baseline = baseline or rate
+            label = f"{backend}{' (partial)' if partial else ''}"
+            print(f"{label:>22}: {rate:8.1f} pages/s  ({rate / baseline:.1f}x html.parser)")
@@ -0,0 +1 @@
+"""Shared building blocks for the Finova collectors (transport, caching, parsing)."""
@@ -0,0 +1,103 @@
+"""Asyncio fetch engine with per-host concurrency caps.
+
+Requests still go through the pooled ``transport`` session; each one runs in
+a worker thread while an ``asyncio.Semaphore`` per host (or named lane, e.g.
+``"screener_search"`` vs ``"screener_page"`` on the same host) bounds how many
+are in flight at once.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+
+from common import transport
+from common.ratelimit import Ticket
+
+T = TypeVar("T")
+
+# How often first_in_priority checks whether a queued lookup has been sent
+SENT_POLL = 0.05
+
+
+class HostLimiter:
+    """Lazily created semaphore per host/lane key."""
+
+    def __init__(self, limits: Dict[str, int], default: int = 4):
+        self.limits = dict(limits)
+        self.default = default
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def semaphore(self, key: str) -> asyncio.Semaphore:
+        if key not in self._semaphores:
+            self._semaphores[key] = asyncio.Semaphore(self.limits.get(key, self.default))
+        return self._semaphores[key]
+
+
+async def call(limiter: HostLimiter, key: str, func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking fetcher in a worker thread under the cap for ``key``."""
+    async with limiter.semaphore(key):
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+
+async def fetch(limiter: HostLimiter, url: str, lane: Optional[str] = None,
+                **kwargs) -> requests.Response:
+    """GET ``url`` under the cap for ``lane`` (defaults to the URL's host)."""
+    key = lane or urlsplit(url).hostname or ""
+    return await call(limiter, key, transport.get, url, **kwargs)
+
+
+async def first_in_priority(calls: List[Callable[[Ticket], Awaitable[T]]],
+                            stagger: float) -> Optional[T]:
+    """Async counterpart of ``fanout.first_in_priority``: calls start in priority
+    order (after a miss, or once the previous request has been out for
+    ``stagger`` seconds), and once the winner is known the tickets are
+    cancelled and the remaining tasks with them."""
+    cancel = threading.Event()
+    tickets: List[Ticket] = []
+    tasks: List[asyncio.Future] = []
+
+    def start_next() -> None:
+        ticket = Ticket(cancel)
+        tasks.append(asyncio.ensure_future(calls[len(tasks)](ticket)))
+        tickets.append(ticket)
+
+    if not calls:
+        return None
+    start_next()
+    try:
+        for i in range(len(calls)):
+            task = tasks[i]
+            while len(tasks) < len(calls):
+                # the ticket is set from a worker thread, so poll it while the task runs
+                while not tickets[i].sent.is_set() and not task.done():
+                    await asyncio.wait([task], timeout=SENT_POLL)
+                done, _ = await asyncio.wait([task], timeout=stagger)
+                if done:
+                    break
+                start_next()
+            try:
+                result = await task
+            except Exception:
+                result = None
+            if result:
+                return result
+            if len(tasks) == i + 1 and len(tasks) < len(calls):
+                start_next()
+        return None
+    finally:
+        cancel.set()
+        for task in tasks:
+            task.cancel()
+
+
+def run(coro: Awaitable[T], max_workers: int = 32) -> T:
+    """Run ``coro`` on a fresh event loop whose thread pool fits ``max_workers`` requests."""
+    async def _main():
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        loop.set_default_executor(executor)
+        return await coro
+    return asyncio.run(_main())
@@ -0,0 +1,220 @@
+"""Content-addressed, compressed archive of every raw page we fetch.
+
+Bodies are stored once per SHA-256 under ``ArchiveConfig.DIR/blobs`` and an
+SQLite index records which URL returned which body at what time. Blobs are
+compressed with zstd (``zstandard`` is optional; zlib is used without it).
+Screener pages share most of their markup, so after a few have been archived
+a dictionary can be trained on them, which shrinks each page several times
+further::
+
+    python -m common.archive train          # train a dictionary on archived Screener pages
+    python -m common.archive stats
+
+Nothing here talks to the network: ``latest_bodies`` and ``load`` are what the
+``--reparse`` modes use to rebuild outputs offline.
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from common.config import ArchiveConfig
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+_local = threading.local()
+_dict_cache: Dict[int, object] = {}
+_dict_lock = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fetches (
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    sha256 TEXT NOT NULL,
+    content_type TEXT,
+    PRIMARY KEY (url, fetched_at)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    dict_id INTEGER,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL
+);
+"""
+
+
+def _db() -> sqlite3.Connection:
+    """Per-thread connection to the archive index."""
+    conn = getattr(_local, "conn", None)
+    # reconnect after a fork (reparse workers) or when the archive dir changes
+    if conn is None or _local.key != (os.getpid(), ArchiveConfig.DIR):
+        os.makedirs(ArchiveConfig.DIR, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(ArchiveConfig.DIR, "index.sqlite"), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        _local.conn, _local.key = conn, (os.getpid(), ArchiveConfig.DIR)
+    return conn
+
+
+def _blob_path(sha: str) -> str:
+    return os.path.join(ArchiveConfig.DIR, "blobs", sha[:2], sha)
+
+
+def _dict_path(dict_id: int) -> str:
+    return os.path.join(ArchiveConfig.DIR, "dicts", f"{dict_id}.dict")
+
+
+def should_archive(url: str) -> bool:
+    return (urlsplit(url).hostname or "") in ArchiveConfig.HOSTS
+
+
+# ==================== DICTIONARIES ====================
+def _load_dict(dict_id: int):
+    with _dict_lock:
+        if dict_id not in _dict_cache:
+            with open(_dict_path(dict_id), "rb") as f:
+                _dict_cache[dict_id] = zstandard.ZstdCompressionDict(f.read())
+        return _dict_cache[dict_id]
+
+
+def _current_dict_id() -> Optional[int]:
+    """Newest trained dictionary, if any."""
+    try:
+        ids = [int(name[:-5]) for name in os.listdir(os.path.join(ArchiveConfig.DIR, "dicts"))
+               if name.endswith(".dict")]
+    except OSError:
+        return None
+    current = os.path.join(ArchiveConfig.DIR, "dicts", "CURRENT")
+    if os.path.exists(current):
+        with open(current, "r", encoding="utf-8") as f:
+            return int(f.read().strip())
+    return max(ids) if ids else None
+
+
+def train_dictionary(host: str = "www.screener.in", samples: int = 500) -> Optional[int]:
+    """Train a zstd dictionary on the latest archived pages from ``host``."""
+    if zstandard is None:
+        raise RuntimeError("zstandard is not installed")
+    bodies = [body for _, body in latest_bodies(f"https://{host}/", limit=samples)]
+    if len(bodies) < 8:
+        return None
+    trained = zstandard.train_dictionary(ArchiveConfig.DICT_SIZE, bodies)
+    dict_id = trained.dict_id()
+    os.makedirs(os.path.dirname(_dict_path(dict_id)), exist_ok=True)
+    with open(_dict_path(dict_id), "wb") as f:
+        f.write(trained.as_bytes())
+    with open(os.path.join(ArchiveConfig.DIR, "dicts", "CURRENT"), "w", encoding="utf-8") as f:
+        f.write(str(dict_id))
+    return dict_id
+
+
+# ==================== STORE / LOAD ====================
+def _compress(body: bytes, use_dict: bool) -> Tuple[str, Optional[int], bytes]:
+    if zstandard is None:
+        return "zlib", None, zlib.compress(body, 9)
+    dict_id = _current_dict_id() if use_dict else None
+    if dict_id is not None:
+        compressor = zstandard.ZstdCompressor(level=ArchiveConfig.LEVEL, dict_data=_load_dict(dict_id))
+        return "zstd", dict_id, compressor.compress(body)
+    return "zstd", None, zstandard.ZstdCompressor(level=ArchiveConfig.LEVEL).compress(body)
+
+
+def store(url: str, body: bytes, content_type: str = "", fetched_at: Optional[float] = None) -> str:
+    """Archive ``body`` as fetched from ``url``; returns its SHA-256."""
+    sha = hashlib.sha256(body).hexdigest()
+    conn = _db()
+    if conn.execute("SELECT 1 FROM blobs WHERE sha256 = ?", (sha,)).fetchone() is None:
+        codec, dict_id, data = _compress(body, "screener.in" in (urlsplit(url).hostname or ""))
+        path = _blob_path(sha)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        conn.execute("INSERT OR IGNORE INTO blobs VALUES (?, ?, ?, ?, ?)",
+                     (sha, codec, dict_id, len(body), len(data)))
+    conn.execute("INSERT OR REPLACE INTO fetches VALUES (?, ?, ?, ?)",
+                 (url, fetched_at or time.time(), sha, content_type))
+    conn.commit()
+    return sha
+
+
+def store_if_new(url: str, body: bytes, content_type: str = "") -> str:
+    """``store`` unless ``body`` already is the latest archived body of ``url``."""
+    sha = hashlib.sha256(body).hexdigest()
+    row = _db().execute(
+        "SELECT sha256 FROM fetches WHERE url = ? ORDER BY fetched_at DESC LIMIT 1", (url,)
+    ).fetchone()
+    if row and row[0] == sha:
+        return sha
+    return store(url, body, content_type)
+
+
+def load(sha: str) -> bytes:
+    """Decompressed body for ``sha``."""
+    codec, dict_id = _db().execute(
+        "SELECT codec, dict_id FROM blobs WHERE sha256 = ?", (sha,)
+    ).fetchone()
+    with open(_blob_path(sha), "rb") as f:
+        data = f.read()
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if zstandard is None:
+        raise RuntimeError("zstandard is required to read this archive")
+    dict_data = _load_dict(dict_id) if dict_id is not None else None
+    return zstandard.ZstdDecompressor(dict_data=dict_data).decompress(data)
+
+
+def latest_fetches(url_prefix: str = "", limit: Optional[int] = None) -> List[Tuple[str, str]]:
+    """(url, sha256) of the most recent fetch of every URL starting with ``url_prefix``."""
+    query = ("SELECT url, sha256, MAX(fetched_at) FROM fetches WHERE url LIKE ? ESCAPE '\\' "
+             "GROUP BY url ORDER BY url")
+    pattern = url_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    rows = _db().execute(query, (pattern,)).fetchall()
+    return [(url, sha) for url, sha, _ in rows[:limit]]
+
+
+def latest_bodies(url_prefix: str = "", limit: Optional[int] = None) -> Iterator[Tuple[str, bytes]]:
+    for url, sha in latest_fetches(url_prefix, limit):
+        yield url, load(sha)
+
+
+def latest_body(url: str) -> Optional[bytes]:
+    row = _db().execute(
+        "SELECT sha256 FROM fetches WHERE url = ? ORDER BY fetched_at DESC LIMIT 1", (url,)
+    ).fetchone()
+    return load(row[0]) if row else None
+
+
+def stats() -> Dict[str, int]:
+    conn = _db()
+    fetches = conn.execute("SELECT COUNT(*), COUNT(DISTINCT url) FROM fetches").fetchone()
+    blobs = conn.execute("SELECT COUNT(*), SUM(size), SUM(stored_size) FROM blobs").fetchone()
+    return {"fetches": fetches[0], "urls": fetches[1], "blobs": blobs[0],
+            "raw_bytes": blobs[1] or 0, "stored_bytes": blobs[2] or 0}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Raw page archive maintenance")
+    parser.add_argument("command", choices=["train", "stats"])
+    parser.add_argument("--host", default="www.screener.in")
+    args = parser.parse_args()
+
+    if args.command == "train":
+        dict_id = train_dictionary(args.host)
+        print(f"📚 Trained dictionary {dict_id}" if dict_id else "⚠ Not enough archived pages to train")
+    else:
+        s = stats()
+        ratio = s["raw_bytes"] / s["stored_bytes"] if s["stored_bytes"] else 0
+        print(f"{s['fetches']} fetches of {s['urls']} URLs, {s['blobs']} unique bodies, "
+              f"{s['raw_bytes'] / 1e6:.1f} MB → {s['stored_bytes'] / 1e6:.1f} MB ({ratio:.1f}x)")
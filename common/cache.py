@@ -0,0 +1,115 @@
+"""Persistent HTTP response cache keyed by URL.
+
+Each entry is a pair of files under ``HttpConfig.CACHE_DIR``: the raw body and
+a small JSON sidecar with the status, validators (ETag / Last-Modified) and the
+time it was last confirmed fresh. Entries younger than the host's TTL are served
+without touching the network; older ones are revalidated with a conditional GET
+so an unchanged page costs a 304 instead of a full download.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import requests
+
+from common.config import HttpConfig
+
+# Response headers kept with the body
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+def ttl_for(url: str) -> int:
+    """Cache lifetime in seconds for the host of ``url`` (0 = not cached)."""
+    return HttpConfig.CACHE_TTL.get(urlsplit(url).hostname or "", 0)
+
+
+def cache_key(url: str, params: Optional[Dict] = None) -> str:
+    full_url = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+    return hashlib.sha256(full_url.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or HttpConfig.CACHE_DIR
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, key[:2], key)
+        return base + ".body", base + ".json"
+
+    def load(self, key: str) -> Optional[Tuple[Dict, bytes]]:
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key: str, meta: Dict, body: Optional[bytes] = None) -> None:
+        """Write the sidecar (and body, if given) atomically."""
+        body_path, meta_path = self._paths(key)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        if body is not None:
+            _atomic_write(body_path, body)
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _to_response(url: str, meta: Dict, body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = meta.get("status", 200)
+    response._content = body
+    response.headers.update(meta.get("headers", {}))
+    response.url = meta.get("url", url)
+    response.encoding = meta.get("encoding")
+    return response
+
+
+def cached_get(send: Callable[..., requests.Response], url: str, params: Optional[Dict] = None,
+               headers: Optional[Dict[str, str]] = None, ttl: int = 0,
+               force_refresh: Optional[bool] = None, cache: Optional[ResponseCache] = None,
+               **kwargs) -> requests.Response:
+    """GET through the disk cache; ``send`` performs the actual network request."""
+    cache = cache or ResponseCache()
+    if force_refresh is None:
+        force_refresh = HttpConfig.CACHE_FORCE_REFRESH
+    key = cache_key(url, params)
+    entry = None if force_refresh else cache.load(key)
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        meta, body = entry
+        if time.time() - meta.get("checked_at", 0) < ttl:
+            return _to_response(url, meta, body)
+        if meta["headers"].get("ETag"):
+            request_headers["If-None-Match"] = meta["headers"]["ETag"]
+        if meta["headers"].get("Last-Modified"):
+            request_headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+
+    response = send(url, params=params, headers=request_headers, **kwargs)
+
+    if response.status_code == 304 and entry is not None:
+        meta["checked_at"] = time.time()
+        cache.store(key, meta)
+        return _to_response(url, meta, body)
+
+    if response.status_code == 200:
+        cache.store(key, {
+            "url": response.url,
+            "status": response.status_code,
+            "encoding": response.encoding,
+            "headers": {h: response.headers[h] for h in _KEPT_HEADERS if h in response.headers},
+            "checked_at": time.time(),
+        }, response.content)
+    return response
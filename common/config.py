@@ -0,0 +1,90 @@
+"""Project-wide settings shared by every collector script."""
+import os
+from typing import Dict, Tuple
+
+
+# Root for everything the collectors persist between runs (caches, health scores, ...)
+STATE_DIR = os.environ.get("FINOVA_STATE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "finova"))
+
+
+class HttpConfig:
+    # Default headers sent on every request (powerbi.Config.HEADERS points here)
+    HEADERS: Dict[str, str] = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    }
+
+    # (connect, read) timeouts in seconds
+    TIMEOUT: Tuple[float, float] = (5.0, 20.0)
+    HOST_TIMEOUTS: Dict[str, Tuple[float, float]] = {
+        "query2.finance.yahoo.com": (5.0, 10.0),
+        "www.screener.in": (5.0, 20.0),
+        "nitter.net": (5.0, 10.0),
+        "nitter.privacydev.net": (5.0, 10.0),
+        "nitter.lacontrevoie.fr": (5.0, 10.0),
+        "seekingalpha.com": (5.0, 10.0),
+        "www.youtube.com": (5.0, 10.0),
+    }
+
+    # Connection pooling: number of per-host pools kept alive and
+    # the maximum number of keep-alive connections inside each pool
+    POOL_CONNECTIONS = 16
+    POOL_MAXSIZE = 32
+    MAX_RETRIES = 2
+
+    # Token-bucket limits per host: (sustained requests per second, burst capacity)
+    RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+        "query2.finance.yahoo.com": (1.0, 3),
+        "www.screener.in": (2.0, 4),
+        "seekingalpha.com": (1.0, 2),
+    }
+    if os.environ.get("FINOVA_NO_RATE_LIMIT", "") == "1":
+        RATE_LIMITS = {}
+
+    # On-disk response cache: hosts listed here are cached for the given
+    # number of seconds, then revalidated with If-None-Match/If-Modified-Since
+    CACHE_DIR = os.environ.get("FINOVA_CACHE_DIR", os.path.join(STATE_DIR, "http"))
+    CACHE_TTL: Dict[str, int] = {
+        "www.screener.in": 24 * 3600,
+    }
+    # Ignore cached entries and download everything again (set by --refresh)
+    CACHE_FORCE_REFRESH = os.environ.get("FINOVA_REFRESH", "") == "1"
+
+    # Offline benchmarking (see common/replay.py): save every response to
+    # RECORD_DIR, and/or send every request to a local stand-in server
+    RECORD_DIR = os.environ.get("FINOVA_RECORD_DIR", "")
+    STANDIN_URL = os.environ.get("FINOVA_STANDIN_URL", "")
+
+
+class ParseConfig:
+    # HTML parser backend: "auto" picks the fastest installed one
+    # (selectolax, then lxml, then the built-in html.parser)
+    HTML_BACKEND = os.environ.get("FINOVA_HTML_PARSER", "auto")
+    # Build BeautifulSoup trees only for the Screener sections a caller asks for
+    PARTIAL_PARSE = os.environ.get("FINOVA_FULL_PARSE", "") != "1"
+    # Parsed tables/rows stored by hash of the page body (see common/resultcache.py)
+    RESULT_CACHE = os.environ.get("FINOVA_RESULT_CACHE", "1") != "0"
+    RESULT_CACHE_DIR = os.path.join(STATE_DIR, "parsed")
+
+
+class ArchiveConfig:
+    # Raw copy of every fetched page from these hosts (see common/archive.py)
+    ENABLED = os.environ.get("FINOVA_ARCHIVE", "1") != "0"
+    DIR = os.environ.get("FINOVA_ARCHIVE_DIR", os.path.join(STATE_DIR, "archive"))
+    HOSTS = {
+        "www.screener.in",
+        "query2.finance.yahoo.com",
+        "feeds.finance.yahoo.com",
+        "news.google.com",
+    }
+    LEVEL = 12
+    DICT_SIZE = 112 * 1024
+
+
+class SymbolConfig:
+    # Offline symbol master built from exchange listing files (see common/symbols.py)
+    INDEX = os.environ.get("FINOVA_SYMBOL_INDEX", os.path.join(STATE_DIR, "symbols.idx"))
+    # Persistent name → symbol answers from network resolvers (see common/resolutions.py);
+    # names no resolver could place are remembered for NEGATIVE_TTL so they are not retried
+    RESOLUTION_DB = os.environ.get("FINOVA_RESOLUTION_DB", os.path.join(STATE_DIR, "resolutions.sqlite"))
+    RESOLUTION_TTL = 30 * 24 * 3600
+    NEGATIVE_TTL = 7 * 24 * 3600
@@ -0,0 +1,118 @@
+"""Run independent collectors or lookups concurrently.
+
+``gather_with_deadlines`` runs collectors, each under its own deadline.
+
+Every collector receives a list to append results to. When a collector misses
+its deadline the caller keeps whatever it appended so far and the source is
+reported as timed out; the straggling thread is left to finish in the
+background (it is a daemon and bounded by the transport timeouts).
+"""
+import threading
+import time
+from concurrent.futures import Executor, Future, wait
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from common.ratelimit import Ticket
+
+T = TypeVar("T")
+
+Collector = Callable[[list], object]
+
+
+def gather_with_deadlines(
+    collectors: Dict[str, Tuple[Collector, float]]
+) -> Tuple[Dict[str, list], List[str]]:
+    """Start all ``{name: (collector, deadline_seconds)}`` at once.
+
+    Returns ``(results, timed_out)`` where ``results[name]`` is a snapshot of
+    the items collected before the deadline.
+    """
+    start = time.monotonic()
+    sinks: Dict[str, list] = {}
+    threads: Dict[str, threading.Thread] = {}
+
+    for name, (collector, _) in collectors.items():
+        sinks[name] = []
+        threads[name] = threading.Thread(
+            target=collector, args=(sinks[name],), name=f"collect-{name}", daemon=True
+        )
+        threads[name].start()
+
+    timed_out = []
+    results = {}
+    # Join in deadline order so a short deadline is never held up by a long one
+    for name, (_, deadline) in sorted(collectors.items(), key=lambda kv: kv[1][1]):
+        threads[name].join(max(0.0, start + deadline - time.monotonic()))
+        if threads[name].is_alive():
+            timed_out.append(name)
+        results[name] = list(sinks[name])
+
+    return {name: results[name] for name in collectors}, timed_out
+
+
+def first_in_priority(calls: List[Callable[[Ticket], T]], executor: Executor,
+                      stagger: float) -> Optional[T]:
+    """Run calls in priority order and return the highest-priority truthy result.
+
+    A call starts once the one before it has come back empty (or failed), or
+    once that one's request has been out for ``stagger`` seconds without an
+    answer; time spent queued for a rate-limit token does not count. So when
+    the first call hits, it is the only request sent. Each call receives a
+    ``Ticket`` to pass on to ``transport.get``: once the winner is known the
+    shared cancel flag is set, and calls still queued give up without
+    spending a token.
+    """
+    cancel = threading.Event()
+    tickets: List[Ticket] = []
+    futures: List[Future] = []
+
+    def start_next() -> None:
+        ticket = Ticket(cancel)
+        future = executor.submit(calls[len(futures)], ticket)
+        future.add_done_callback(lambda _: ticket.sent.set())
+        tickets.append(ticket)
+        futures.append(future)
+
+    if not calls:
+        return None
+    start_next()
+    try:
+        for i in range(len(calls)):
+            while len(futures) < len(calls):
+                tickets[i].sent.wait()
+                done, _ = wait([futures[i]], timeout=stagger)
+                if done:
+                    break
+                start_next()
+            try:
+                result = futures[i].result()
+            except Exception:
+                result = None
+            if result:
+                return result
+            if len(futures) == i + 1 and len(futures) < len(calls):
+                start_next()
+        return None
+    finally:
+        cancel.set()
+        for future in futures:
+            future.cancel()
+
+
+class SharedBudget:
+    """Thread-safe countdown shared by concurrent collectors.
+
+    Each collector calls ``take()`` before keeping an item and stops as soon as
+    it returns False, so the combined output never exceeds the budget.
+    """
+
+    def __init__(self, total: int):
+        self._remaining = total
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            if self._remaining <= 0:
+                return False
+            self._remaining -= 1
+            return True
@@ -0,0 +1,111 @@
+"""Hedged requests across interchangeable mirrors, ordered by persisted health.
+
+``hedged_race`` starts the healthiest candidate first and, if it has not
+answered within ``hedge_delay`` (or as soon as it fails), starts the next one
+as well; the first acceptable result wins. Every attempt, including the ones
+that lose the race, updates an ``InstanceHealth`` score (EWMA latency and
+failure rate) that is saved to disk and used to order the next call.
+"""
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class InstanceHealth:
+    ALPHA = 0.3                # EWMA weight of the newest observation
+    DEFAULT_LATENCY = 2.0      # seconds assumed for never-seen instances
+    FAILURE_PENALTY = 10.0     # seconds a failure is worth (roughly one timeout)
+    MAX_CONSECUTIVE_FAILURES = 3
+    COOLDOWN = 15 * 60         # seconds a failing instance is skipped
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.stats: Dict[str, Dict] = json.load(f)
+        except (OSError, ValueError):
+            self.stats = {}
+
+    def score(self, instance: str) -> float:
+        """Expected cost of trying ``instance`` (lower is better)."""
+        s = self.stats.get(instance)
+        if not s:
+            return self.DEFAULT_LATENCY
+        return s["latency"] + s["failure_rate"] * self.FAILURE_PENALTY
+
+    def is_benched(self, instance: str) -> bool:
+        s = self.stats.get(instance, {})
+        return (s.get("consecutive_failures", 0) >= self.MAX_CONSECUTIVE_FAILURES
+                and time.time() - s.get("last_failure", 0) < self.COOLDOWN)
+
+    def ranked(self, instances: Iterable[str]) -> List[str]:
+        """Healthy instances best-first; benched ones only if nothing else is left."""
+        instances = list(instances)
+        healthy = [i for i in instances if not self.is_benched(i)] or instances
+        return sorted(healthy, key=self.score)
+
+    def record(self, instance: str, ok: bool, latency: float) -> None:
+        with self._lock:
+            s = self.stats.setdefault(instance, {
+                "latency": latency, "failure_rate": 0.0 if ok else 1.0,
+                "consecutive_failures": 0, "last_failure": 0,
+            })
+            s["latency"] += self.ALPHA * (latency - s["latency"])
+            s["failure_rate"] += self.ALPHA * ((0.0 if ok else 1.0) - s["failure_rate"])
+            if ok:
+                s["consecutive_failures"] = 0
+            else:
+                s["consecutive_failures"] += 1
+                s["last_failure"] = time.time()
+            self._save()
+
+    def _save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.stats, f, indent=2)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+def hedged_race(candidates: Iterable[str], attempt: Callable[[str], T], hedge_delay: float,
+                health: Optional[InstanceHealth] = None,
+                accept: Callable[[T], bool] = bool) -> Optional[T]:
+    """Return the first result from ``attempt(candidate)`` that ``accept`` approves."""
+    pending = list(candidates)
+    results: "queue.Queue" = queue.Queue()
+
+    def run(candidate: str) -> None:
+        start = time.monotonic()
+        try:
+            value = attempt(candidate)
+            ok = accept(value)
+        except Exception:
+            value, ok = None, False
+        if health is not None:
+            health.record(candidate, ok, time.monotonic() - start)
+        results.put((ok, value))
+
+    launched = finished = 0
+    while pending or finished < launched:
+        if pending:
+            threading.Thread(target=run, args=(pending.pop(0),), daemon=True).start()
+            launched += 1
+        try:
+            ok, value = results.get(timeout=hedge_delay if pending else None)
+        except queue.Empty:
+            continue  # slow answer: hedge with the next candidate
+        finished += 1
+        if ok:
+            return value
+        # a failure starts the next candidate straight away
+    return None
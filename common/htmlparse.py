@@ -0,0 +1,61 @@
+"""Pluggable HTML parser backends.
+
+``selectolax`` (lexbor) and ``lxml`` are optional; when neither is installed
+everything falls back to the built-in ``html.parser``. Markup can be passed
+as response bytes so no separate ``str`` decode is needed first.
+"""
+from typing import List, Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from common.config import ParseConfig
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional dependency
+    LexborHTMLParser = None
+
+try:
+    import lxml  # noqa: F401  (only needed as a BeautifulSoup feature)
+    HAS_LXML = True
+except ImportError:  # optional dependency
+    HAS_LXML = False
+
+Markup = Union[str, bytes]
+
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+
+def available_backends() -> List[str]:
+    return [b for b in BACKENDS
+            if (b == "selectolax" and LexborHTMLParser is not None)
+            or (b == "lxml" and HAS_LXML)
+            or b == "html.parser"]
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """Concrete backend for ``backend`` (None → ParseConfig.HTML_BACKEND, "auto" → fastest)."""
+    backend = backend or ParseConfig.HTML_BACKEND
+    available = available_backends()
+    if backend == "auto":
+        return available[0]
+    return backend if backend in available else "html.parser"
+
+
+def make_soup(markup: Markup, backend: Optional[str] = None,
+              parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """BeautifulSoup tree using lxml when it is available/requested, else html.parser."""
+    backend = resolve_backend(backend)
+    if backend != "html.parser" and HAS_LXML:
+        return BeautifulSoup(markup, "lxml", parse_only=parse_only)
+    return BeautifulSoup(markup, "html.parser", parse_only=parse_only)
+
+
+def select_texts(markup: Markup, selector: str, limit: Optional[int] = None,
+                 backend: Optional[str] = None) -> List[str]:
+    """Stripped text of every element matching ``selector`` (at most ``limit``)."""
+    if resolve_backend(backend) == "selectolax":
+        nodes = LexborHTMLParser(markup).css(selector)
+        return [node.text(strip=True) for node in nodes[:limit]]
+    nodes = make_soup(markup, backend).select(selector, limit=limit or None)
+    return [node.get_text(strip=True) for node in nodes]
@@ -0,0 +1,104 @@
+"""Find every watched company an article mentions in one pass.
+
+All names and aliases of all companies go into a single Aho–Corasick
+automaton, so scanning a text costs one walk over its characters however many
+companies are watched, instead of one substring search per company per alias.
+A hit only counts on word boundaries ("apple" does not match "pineapple").
+
+``pyahocorasick`` (C implementation) is used when installed; otherwise a
+pure-Python automaton with the same behaviour is built.
+"""
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Mapping, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # optional dependency
+    ahocorasick = None
+
+Output = List[Tuple[int, str]]  # (pattern length, label) for every pattern ending at a state
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class _Automaton:
+    """Minimal Aho–Corasick automaton with the pyahocorasick iter() contract."""
+
+    def __init__(self, patterns: Mapping[str, Output]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[Output] = [[]]
+        for pattern, output in patterns.items():
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._out.append([])
+                state = nxt
+            self._out[state] = list(output)
+
+        # breadth-first failure links; each state also reports its suffixes' outputs
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0) if state else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter(self, text: str) -> Iterator[Tuple[int, Output]]:
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                yield i, out[state]
+
+
+class AliasMatcher:
+    def __init__(self, aliases: Mapping[str, Iterable[str]]):
+        """``aliases`` maps a label (company name) to every string that identifies it."""
+        patterns: Dict[str, Output] = {}
+        for label, names in aliases.items():
+            for name in names:
+                pattern = _normalize(name)
+                if pattern and (len(pattern), label) not in patterns.get(pattern, []):
+                    patterns.setdefault(pattern, []).append((len(pattern), label))
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for pattern, output in patterns.items():
+                self._automaton.add_word(pattern, output)
+            if patterns:
+                self._automaton.make_automaton()
+        else:
+            self._automaton = _Automaton(patterns)
+        self._empty = not patterns
+
+    def matches(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """(label, start, end) for every whole-word hit, in the normalized (lowercased) text."""
+        if self._empty:
+            return
+        text = _normalize(text)
+        n = len(text)
+        for end, output in self._automaton.iter(text):
+            if end + 1 < n and text[end + 1].isalnum():
+                continue
+            for length, label in output:
+                start = end - length + 1
+                if start == 0 or not text[start - 1].isalnum():
+                    yield label, start, end + 1
+
+    def mentions(self, text: str) -> List[str]:
+        """Every label mentioned in ``text``, in order of first appearance."""
+        return list(dict.fromkeys(label for label, _, _ in self.matches(text)))
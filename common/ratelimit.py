@@ -0,0 +1,105 @@
+"""Per-host token-bucket rate limiting shared by every fetch path.
+
+A bucket refills at ``rate`` tokens per second up to ``capacity``. Each request
+takes one token; when the bucket is empty the caller sleeps only as long as it
+takes for its token to arrive, so idle time is never wasted on a fixed delay.
+Tokens are reserved under a lock, which keeps the limit correct when worker
+threads (including the asyncio engine's) share a bucket. A request that holds
+a ``Ticket`` can be abandoned until it is sent: cancelled while queued, it gets
+its token refunded.
+"""
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from common.config import HttpConfig
+
+
+class Cancelled(Exception):
+    """The request was abandoned before it was sent."""
+
+
+class Ticket:
+    """One of several competing requests (see ``fanout.first_in_priority``).
+
+    ``cancel`` is shared by all competitors and set once a winner is known;
+    ``sent`` is this request's own flag, set as soon as it holds its token.
+    """
+
+    def __init__(self, cancel: threading.Event):
+        self.cancel = cancel
+        self.sent = threading.Event()
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be > 0 and capacity >= 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def refund(self) -> None:
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def acquire(self, cancel: Optional[threading.Event] = None) -> None:
+        if cancel is not None and cancel.is_set():
+            raise Cancelled()
+        delay = self.reserve()
+        if delay <= 0:
+            return
+        if cancel is None:
+            time.sleep(delay)
+        elif cancel.wait(delay):
+            self.refund()
+            raise Cancelled()
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def bucket_for(url: str) -> Optional[TokenBucket]:
+    """Shared bucket for the host of ``url``, or None if the host is not limited."""
+    host = urlsplit(url).hostname or ""
+    limit = HttpConfig.RATE_LIMITS.get(host)
+    if limit is None:
+        return None
+    with _buckets_lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket(*limit)
+        return _buckets[host]
+
+
+def acquire(url: str, ticket: Optional[Ticket] = None) -> None:
+    """Block until a request to the host of ``url`` is allowed.
+
+    Raises ``Cancelled`` (without spending a token) if the ticket is cancelled first.
+    """
+    cancel = ticket.cancel if ticket is not None else None
+    bucket = bucket_for(url)
+    if bucket is not None:
+        bucket.acquire(cancel)
+    elif cancel is not None and cancel.is_set():
+        raise Cancelled()
+    if ticket is not None:
+        ticket.sent.set()
+
+
+def reset() -> None:
+    """Drop all buckets so changed HttpConfig.RATE_LIMITS take effect."""
+    with _buckets_lock:
+        _buckets.clear()
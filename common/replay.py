@@ -0,0 +1,154 @@
+"""Record real HTTP responses and replay them from a local stand-in server.
+
+Record mode (``FINOVA_RECORD_DIR=recordings``) saves every response that
+``transport`` receives. The stand-in server replays a recording directory
+with configurable latency, jitter and error rate::
+
+    python -m common.replay --dir recordings --port 8765 --latency 80 --jitter 40 --error-rate 0.02
+
+Pointing the collectors at it is purely configuration
+(``FINOVA_STANDIN_URL=http://127.0.0.1:8765``): transport rewrites
+``https://www.screener.in/company/TCS/`` to
+``http://127.0.0.1:8765/https/www.screener.in/company/TCS/``.
+When a URL was never recorded the server falls back to a recording with the
+same host and path, then to one with the same host and first path segment,
+so a handful of recorded pages can stand in for a 1,000-company run.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from common.config import HttpConfig
+
+
+def full_url(url: str, params: Optional[Dict] = None) -> str:
+    """URL with its query string exactly as requests would send it."""
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+def recording_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def rewrite(url: str) -> str:
+    """Map an upstream URL onto the configured stand-in server."""
+    parts = urlsplit(url)
+    target = f"{HttpConfig.STANDIN_URL.rstrip('/')}/{parts.scheme}/{parts.netloc}{parts.path or '/'}"
+    return f"{target}?{parts.query}" if parts.query else target
+
+
+def record(url: str, response: requests.Response) -> None:
+    """Save ``response`` for ``url`` under HttpConfig.RECORD_DIR."""
+    os.makedirs(HttpConfig.RECORD_DIR, exist_ok=True)
+    base = os.path.join(HttpConfig.RECORD_DIR, recording_key(url))
+    with open(base + ".body", "wb") as f:
+        f.write(response.content)
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump({
+            "url": url,
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type", ""),
+        }, f)
+
+
+# ==================== STAND-IN SERVER ====================
+class Recordings:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.by_key: Dict[str, Dict] = {}
+        self.by_path: Dict[str, str] = {}
+        self.by_prefix: Dict[str, str] = {}
+        for name in os.listdir(directory):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            key = name[:-5]
+            self.by_key[key] = meta
+            parts = urlsplit(meta["url"])
+            self.by_path.setdefault(parts.netloc + parts.path, key)
+            self.by_prefix.setdefault(parts.netloc + "/" + parts.path.strip("/").split("/")[0], key)
+
+    def lookup(self, url: str, strict: bool = False) -> Optional[str]:
+        key = recording_key(url)
+        if key in self.by_key or strict:
+            return key if key in self.by_key else None
+        parts = urlsplit(url)
+        return (self.by_path.get(parts.netloc + parts.path)
+                or self.by_prefix.get(parts.netloc + "/" + parts.path.strip("/").split("/")[0]))
+
+    def load(self, key: str):
+        with open(os.path.join(self.directory, key + ".body"), "rb") as f:
+            return self.by_key[key], f.read()
+
+
+def make_handler(recordings: Recordings, latency: float, jitter: float,
+                 error_rate: float, strict: bool):
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            # /<scheme>/<host>/<path>?<query>  →  <scheme>://<host>/<path>?<query>
+            scheme, _, rest = self.path.lstrip("/").partition("/")
+            url = f"{scheme}://{rest}"
+            delay = latency + random.uniform(-jitter, jitter)
+            if delay > 0:
+                time.sleep(delay / 1000.0)
+
+            key = recordings.lookup(url, strict)
+            if random.random() < error_rate:
+                self._reply(503, b"stand-in injected error", "text/plain")
+            elif key is None:
+                self._reply(404, b"not recorded", "text/plain")
+            else:
+                meta, body = recordings.load(key)
+                self._reply(meta["status"], body, meta["content_type"])
+
+        def _reply(self, status: int, body: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type or "application/octet-stream")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return StandInHandler
+
+
+def serve(directory: str, host: str = "127.0.0.1", port: int = 8765, latency: float = 0.0,
+          jitter: float = 0.0, error_rate: float = 0.0, strict: bool = False) -> ThreadingHTTPServer:
+    """Build a stand-in server over ``directory`` (call ``serve_forever`` to run it)."""
+    handler = make_handler(Recordings(directory), latency, jitter, error_rate, strict)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded responses as a local stand-in server")
+    parser.add_argument("--dir", default=HttpConfig.RECORD_DIR or "recordings")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="mean added latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="± uniform jitter in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 503 replies")
+    parser.add_argument("--strict", action="store_true", help="404 on URLs that were not recorded")
+    args = parser.parse_args()
+
+    server = serve(args.dir, args.host, args.port, args.latency, args.jitter,
+                   args.error_rate, args.strict)
+    print(f"🛰  Stand-in serving {args.dir} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
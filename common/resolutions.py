@@ -0,0 +1,91 @@
+"""Persistent cache of company-name → symbol resolutions.
+
+Network symbol searches are slow and their answers rarely change, so every
+answer is stored in SQLite together with the resolver that produced it.
+Names that no resolver could place are stored too (``symbol`` is NULL) with a
+shorter TTL, so an unresolvable name costs one lookup per ``NEGATIVE_TTL``
+instead of a full search on every run. ``--refresh`` (``CACHE_FORCE_REFRESH``)
+ignores stored answers and overwrites them.
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from common.config import HttpConfig, SymbolConfig
+
+_local = threading.local()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resolutions (
+    name TEXT PRIMARY KEY,
+    symbol TEXT,
+    source TEXT NOT NULL,
+    resolved_at REAL NOT NULL
+);
+"""
+
+
+class Resolution(NamedTuple):
+    symbol: Optional[str]  # None for a cached miss
+    source: str
+    resolved_at: float
+
+
+def _db() -> sqlite3.Connection:
+    """Per-thread connection to the resolution cache."""
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.key != (os.getpid(), SymbolConfig.RESOLUTION_DB):
+        os.makedirs(os.path.dirname(os.path.abspath(SymbolConfig.RESOLUTION_DB)), exist_ok=True)
+        conn = sqlite3.connect(SymbolConfig.RESOLUTION_DB, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        _local.conn, _local.key = conn, (os.getpid(), SymbolConfig.RESOLUTION_DB)
+    return conn
+
+
+def get(name: str) -> Optional[Resolution]:
+    """Unexpired answer (or miss) for ``name``; None when it has to be resolved again."""
+    if HttpConfig.CACHE_FORCE_REFRESH:
+        return None
+    try:
+        row = _db().execute(
+            "SELECT symbol, source, resolved_at FROM resolutions WHERE name = ?", (name,)
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    if row is None:
+        return None
+    found = Resolution(*row)
+    ttl = SymbolConfig.RESOLUTION_TTL if found.symbol else SymbolConfig.NEGATIVE_TTL
+    return found if time.time() - found.resolved_at < ttl else None
+
+
+def put(name: str, symbol: Optional[str], source: str) -> None:
+    """Store an answer; pass ``symbol=None`` to remember that ``name`` did not resolve."""
+    try:
+        conn = _db()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO resolutions (name, symbol, source, resolved_at) VALUES (?, ?, ?, ?)",
+                (name, symbol or None, source, time.time()),
+            )
+    except sqlite3.Error:
+        pass
+
+
+def purge_expired() -> int:
+    """Drop expired rows so the cache does not grow without bound; returns how many were removed."""
+    now = time.time()
+    try:
+        conn = _db()
+        with conn:
+            cur = conn.execute(
+                "DELETE FROM resolutions WHERE (symbol IS NOT NULL AND resolved_at < ?) "
+                "OR (symbol IS NULL AND resolved_at < ?)",
+                (now - SymbolConfig.RESOLUTION_TTL, now - SymbolConfig.NEGATIVE_TTL),
+            )
+    except sqlite3.Error:
+        return 0
+    return cur.rowcount
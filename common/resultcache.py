@@ -0,0 +1,51 @@
+"""Parsed-result cache keyed by a hash of the raw response body.
+
+Screener pages often come back byte-identical between runs; storing what we
+derived from a body under ``sha256(body + version parts)`` lets an unchanged
+page skip DOM construction and normalization entirely. Callers put a parser
+version in the key so a change to the parsing rules invalidates old entries.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Optional
+
+from common.config import ParseConfig
+
+
+def content_key(body: bytes, *parts: Any) -> str:
+    digest = hashlib.sha256(body)
+    for part in parts:
+        digest.update(b"\0" + str(part).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or ParseConfig.RESULT_CACHE_DIR
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key: str) -> Optional[Any]:
+        if not ParseConfig.RESULT_CACHE:
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        if not ParseConfig.RESULT_CACHE:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError:
+            pass
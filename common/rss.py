@@ -0,0 +1,65 @@
+"""Incremental RSS 2.0 reader for the Yahoo Finance and Google News feeds.
+
+``iter_feed_entries`` feeds the response body to an XML pull parser in chunks
+and yields each ``<item>`` as soon as its end tag is read, so a caller that
+stops after ``limit`` entries never parses (or normalizes) the rest of the
+feed. Anything that is not well-formed RSS 2.0 falls back to feedparser.
+"""
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, Optional
+
+CHUNK_SIZE = 16 * 1024
+
+FIELDS = {"title": "title", "summary": "description", "published": "pubDate", "link": "link"}
+
+
+class NotRSS(ValueError):
+    pass
+
+
+def _stream_items(body: bytes) -> Iterator[Dict[str, str]]:
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root_checked = False
+    for offset in range(0, len(body), CHUNK_SIZE):
+        parser.feed(body[offset:offset + CHUNK_SIZE])
+        for event, elem in parser.read_events():
+            if not root_checked:
+                if event != "start" or elem.tag != "rss":
+                    raise NotRSS(elem.tag)
+                root_checked = True
+            if event == "end" and elem.tag == "item":
+                yield {field: (elem.findtext(tag) or "").strip() for field, tag in FIELDS.items()}
+                elem.clear()
+    parser.close()
+
+
+def _feedparser_items(body: bytes) -> Iterator[Dict[str, str]]:
+    import feedparser
+
+    for entry in feedparser.parse(body).entries:
+        yield {field: entry.get(field, "") for field in FIELDS}
+
+
+def iter_feed_entries(body: bytes) -> Iterator[Dict[str, str]]:
+    """Yield ``{"title", "summary", "published", "link"}`` per feed entry, in order."""
+    yielded = 0
+    try:
+        for item in _stream_items(body):
+            yield item
+            yielded += 1
+        return
+    except (ET.ParseError, NotRSS):
+        pass
+    # malformed or not RSS 2.0: let feedparser cope, skipping what we already yielded
+    for i, item in enumerate(_feedparser_items(body)):
+        if i >= yielded:
+            yield item
+
+
+def parse_feed(body: bytes, limit: Optional[int] = None) -> List[Dict[str, str]]:
+    entries = []
+    for item in iter_feed_entries(body):
+        if limit is not None and len(entries) >= limit:
+            break
+        entries.append(item)
+    return entries
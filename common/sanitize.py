@@ -0,0 +1,45 @@
+"""Fast markup stripping for text that is scored and stored.
+
+Google News summaries are ``<ol><li><a href=...>Headline</a> <font>Publisher</font>``
+blobs that repeat the entry title. ``sanitize_html`` splits a fragment on its
+tags with one regex (no DOM), keeps each distinct text segment once and returns
+the link targets separately. Only real tags (``<`` followed by a letter, ``/``
+or ``!``) are stripped, so a bare ``<`` or ``>`` in a tweet or comment stays.
+"""
+import html
+import re
+from typing import List, Set, Tuple
+
+_TAG_RE = re.compile(r"<[A-Za-z/!][^>]*>")
+# "Headline - Publisher": each side also counts as a segment seen earlier
+_TITLE_SEP_RE = re.compile(r"\s+[-\u2013\u2014|]\s+")
+_HREF_RE = re.compile(r"""href\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+
+
+def sanitize_html(fragment: str) -> Tuple[str, List[str]]:
+    """Return ``(clean_text, urls)`` for an HTML fragment.
+
+    A segment is dropped when it repeats an earlier segment exactly, or one
+    side of an earlier "Title - Publisher" (a summary headline repeating the
+    title, a publisher name already in the title). Shorter text that merely
+    occurs inside an earlier segment is kept.
+    """
+    if not fragment:
+        return "", []
+    if "<" not in fragment and "&" not in fragment:
+        return " ".join(fragment.split()), []
+
+    urls = list(dict.fromkeys(html.unescape(u) for u in _HREF_RE.findall(fragment)))
+    kept: List[str] = []
+    seen: Set[str] = set()
+    for segment in _TAG_RE.split(fragment):
+        segment = " ".join(html.unescape(segment).split())
+        if not segment:
+            continue
+        key = segment.casefold()
+        if key in seen:
+            continue
+        kept.append(segment)
+        seen.add(key)
+        seen.update(_TITLE_SEP_RE.split(key))
+    return " ".join(kept), urls
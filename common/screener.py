@@ -0,0 +1,192 @@
+"""Single-pass extraction of everything we read from a Screener company page.
+
+Both ``data_collector.scrape_screener`` and ``powerbi.fetch_screener_data``
+build on ``extract_screener_page``: it walks the document once, and every
+``<section>``, ``#top-ratios`` list and pros/cons block it meets is read from
+its own (small) subtree instead of searching the whole page again.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+from common import archive
+from common.config import ParseConfig
+from common.htmlparse import LexborHTMLParser, Markup, make_soup, resolve_backend
+
+COMPANY_URL_PREFIX = "https://www.screener.in/company/"
+
+# <section id=...> blocks whose first table we keep
+TABLE_SECTIONS = ("profit-loss", "balance-sheet", "cash-flow", "ratios", "shareholding")
+
+
+@dataclass
+class ScreenerTable:
+    headers: List[str]
+    rows: List[List[str]]
+
+
+@dataclass
+class ScreenerPage:
+    title: str = ""          # first <h1> on the page
+    nav_title: str = ""      # <h1> inside div.company-nav
+    tables: Dict[str, ScreenerTable] = field(default_factory=dict)
+    top_ratios: List[Tuple[str, str]] = field(default_factory=list)
+    pros: List[str] = field(default_factory=list)
+    cons: List[str] = field(default_factory=list)
+
+    def table(self, section_id: str) -> Optional[ScreenerTable]:
+        return self.tables.get(section_id)
+
+
+def _text(tag: Tag) -> str:
+    return tag.get_text(strip=True)
+
+
+def _read_table(table: Tag) -> ScreenerTable:
+    headers = []
+    rows = []
+    for part in table.find_all(["thead", "tbody"]):
+        for tr in part.find_all("tr"):
+            cells = tr.find_all(["th", "td"])
+            if part.name == "thead":
+                headers.extend(_text(c) for c in cells if c.name == "th")
+            else:
+                rows.append([_text(c) for c in cells])
+    return ScreenerTable(headers, rows)
+
+
+def _has_class(tag: Tag, name: str) -> bool:
+    return name in (tag.get("class") or ())
+
+
+def extract_screener_page(soup: BeautifulSoup,
+                          sections: Tuple[str, ...] = TABLE_SECTIONS) -> ScreenerPage:
+    page = ScreenerPage()
+    for tag in soup.find_all(["h1", "section", "ul", "div"]):
+        if tag.name == "h1":
+            if not page.title:
+                page.title = _text(tag)
+            if not page.nav_title and tag.find_parent("div", class_="company-nav"):
+                page.nav_title = _text(tag)
+        elif tag.name == "section":
+            section_id = tag.get("id")
+            if section_id in sections and section_id not in page.tables:
+                table = tag.find("table")
+                if table is not None:
+                    page.tables[section_id] = _read_table(table)
+        elif tag.name == "ul":
+            if tag.get("id") == "top-ratios":
+                for li in tag.find_all("li"):
+                    name_tag = li.find(class_="name")
+                    value_tag = li.find(class_="value")
+                    if name_tag and value_tag:
+                        page.top_ratios.append((_text(name_tag), _text(value_tag)))
+        elif _has_class(tag, "pros"):
+            page.pros.extend(_text(li) for li in tag.find_all("li"))
+        elif _has_class(tag, "cons"):
+            page.cons.extend(_text(li) for li in tag.find_all("li"))
+    return page
+
+
+# ==================== PARTIAL PARSING ====================
+OVERVIEW_CLASSES = {"company-nav", "pros", "cons"}
+
+
+class _SectionStrainer(SoupStrainer):
+    """Lets the tree builder create only the blocks ``keep(name, attrs)`` accepts;
+    everything outside them (charts, peers, documents, scripts) is never built."""
+
+    def __init__(self, keep):
+        super().__init__(name=keep)  # bs4 < 4.13 calls keep(name, attrs) itself
+        self._keep = keep
+
+    def allow_tag_creation(self, nsprefix, name, attrs):  # bs4 >= 4.13
+        return self._keep(name, attrs or {})
+
+    def allow_string_creation(self, string):
+        return False
+
+
+def section_strainer(sections: Tuple[str, ...], overview: bool = True) -> SoupStrainer:
+    """Strainer for the wanted ``<section id>`` tables, <h1> and, if ``overview``,
+    the company-nav, #top-ratios and pros/cons blocks."""
+    wanted = set(sections)
+
+    def keep(name, attrs):
+        if name == "section":
+            return attrs.get("id") in wanted
+        if name == "h1":
+            return True
+        if not overview:
+            return False
+        if name == "ul":
+            return attrs.get("id") == "top-ratios"
+        if name == "div":
+            classes = attrs.get("class") or ""
+            classes = classes.split() if isinstance(classes, str) else classes
+            return bool(OVERVIEW_CLASSES.intersection(classes))
+        return False
+
+    return _SectionStrainer(keep)
+
+
+# ==================== SELECTOLAX BACKEND ====================
+def _lexbor_table(table) -> ScreenerTable:
+    headers = [th.text(strip=True) for th in table.css("thead th")]
+    rows = [[c.text(strip=True) for c in tr.css("th, td")] for tr in table.css("tbody tr")]
+    return ScreenerTable(headers, rows)
+
+
+def _extract_with_selectolax(markup: Markup, sections: Tuple[str, ...]) -> ScreenerPage:
+    """Same result as extract_screener_page; lexbor's C selector engine does the walking."""
+    tree = LexborHTMLParser(markup)
+    page = ScreenerPage()
+    h1 = tree.css_first("h1")
+    page.title = h1.text(strip=True) if h1 else ""
+    nav_h1 = tree.css_first("div.company-nav h1")
+    page.nav_title = nav_h1.text(strip=True) if nav_h1 else ""
+    for section_id in sections:
+        table = tree.css_first(f"section#{section_id} table")
+        if table is not None:
+            page.tables[section_id] = _lexbor_table(table)
+    for li in tree.css("ul#top-ratios li"):
+        name_tag = li.css_first(".name")
+        value_tag = li.css_first(".value")
+        if name_tag and value_tag:
+            page.top_ratios.append((name_tag.text(strip=True), value_tag.text(strip=True)))
+    page.pros = [li.text(strip=True) for li in tree.css("div.pros li")]
+    page.cons = [li.text(strip=True) for li in tree.css("div.cons li")]
+    return page
+
+
+def parse_screener_html(markup: Markup, sections: Tuple[str, ...] = TABLE_SECTIONS,
+                        backend: Optional[str] = None, overview: bool = True,
+                        partial: Optional[bool] = None) -> ScreenerPage:
+    """Parse a Screener page (str or response bytes) with the configured backend.
+
+    In partial mode (ParseConfig.PARTIAL_PARSE) BeautifulSoup backends only build
+    the requested sections; ``overview=False`` also skips top ratios and pros/cons.
+    selectolax keeps its whole tree in C memory and is fast enough to parse fully.
+    """
+    if resolve_backend(backend) == "selectolax":
+        return _extract_with_selectolax(markup, sections)
+    if partial is None:
+        partial = ParseConfig.PARTIAL_PARSE
+    parse_only = section_strainer(sections, overview) if partial else None
+    return extract_screener_page(make_soup(markup, backend, parse_only), sections)
+
+
+# ==================== ARCHIVED PAGES ====================
+def company_url(symbol: str) -> str:
+    return f"{COMPANY_URL_PREFIX}{symbol}/consolidated/"
+
+
+def archived_company_pages() -> List[Tuple[str, str]]:
+    """(symbol, body sha256) of the latest archived consolidated page of every company."""
+    pages = []
+    for url, sha in archive.latest_fetches(COMPANY_URL_PREFIX):
+        symbol, _, rest = url[len(COMPANY_URL_PREFIX):].partition("/")
+        if rest == "consolidated/":
+            pages.append((symbol, sha))
+    return pages
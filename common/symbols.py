@@ -0,0 +1,252 @@
+"""Offline symbol master built from exchange listing files.
+
+NSE's ``EQUITY_L.csv`` and BSE's equity list are turned into one compact
+binary index (symbol, legal name, ISIN and aliases as lookup keys), which is
+memory-mapped on first use so opening it costs a few milliseconds no matter
+how many companies it holds::
+
+    python -m common.symbols build EQUITY_L.csv Equity.csv --aliases aliases.csv
+    python -m common.symbols lookup "Tata Consultancy Services Ltd"
+
+The aliases file is an optional ``symbol,alias`` CSV. Resolvers call
+``lookup`` before any network search; when no index has been built it simply
+returns None.
+
+File layout (little-endian)::
+
+    magic | n_records u32 | n_keys u32
+    keys:    n_keys    x (offset u32, length u32, record u32), sorted by key bytes
+    records: n_records x (offset u32, length u32)
+    strings: UTF-8 keys and records ("symbol␟name␟isin␟exchange␟alias␞alias")
+"""
+import argparse
+import csv
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from common.config import SymbolConfig
+
+MAGIC = b"FNSYM\x00\x00\x01"
+_HEADER = struct.Struct("<8sII")
+_KEY = struct.Struct("<III")
+_RECORD = struct.Struct("<II")
+_FIELD_SEP = "\x1f"
+_ALIAS_SEP = "\x1e"
+
+# Column names used by each exchange's listing file
+LISTING_COLUMNS = {
+    "NSE": {"symbol": "SYMBOL", "name": "NAME OF COMPANY", "isin": "ISIN NUMBER"},
+    "BSE": {"symbol": "Security Id", "name": "Security Name", "isin": "ISIN No"},
+}
+TICKER_SUFFIX = {"NSE": ".NS", "BSE": ".BO"}
+
+LEGAL_SUFFIXES = {"limited", "ltd", "inc", "corp", "corporation", "plc", "co", "the"}
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_name(text: str) -> str:
+    """Lookup key for a company name: lowercase words without punctuation or legal suffixes."""
+    words = _NON_ALNUM.sub(" ", text.lower().replace("&", " and ")).split()
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    if len(words) > 1 and words[0] == "the":
+        words.pop(0)
+    return " ".join(words)
+
+
+@dataclass(frozen=True)
+class SymbolRecord:
+    symbol: str
+    name: str
+    isin: str
+    exchange: str
+    aliases: Tuple[str, ...] = ()
+
+    @property
+    def ticker(self) -> str:
+        """Yahoo Finance ticker, e.g. TCS.NS"""
+        return self.symbol + TICKER_SUFFIX.get(self.exchange, "")
+
+    def keys(self) -> List[str]:
+        keys = [normalize_name(self.symbol), normalize_name(self.name)]
+        keys += [normalize_name(a) for a in self.aliases]
+        if self.isin:
+            keys.append(self.isin.lower())
+        return [k for k in dict.fromkeys(keys) if k]
+
+    def _encode(self) -> bytes:
+        fields = (self.symbol, self.name, self.isin, self.exchange, _ALIAS_SEP.join(self.aliases))
+        return _FIELD_SEP.join(fields).encode("utf-8")
+
+    @classmethod
+    def _decode(cls, raw: bytes) -> "SymbolRecord":
+        symbol, name, isin, exchange, aliases = raw.decode("utf-8").split(_FIELD_SEP)
+        return cls(symbol, name, isin, exchange, tuple(a for a in aliases.split(_ALIAS_SEP) if a))
+
+
+class SymbolIndex:
+    """Read-only view over a built index file; lookups binary-search the mapped keys."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.n_records, self.n_keys = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a symbol index")
+        self._keys_at = _HEADER.size
+        self._records_at = self._keys_at + self.n_keys * _KEY.size
+
+    def __len__(self) -> int:
+        return self.n_records
+
+    def _key(self, i: int) -> Tuple[bytes, int]:
+        off, length, rec = _KEY.unpack_from(self._buf, self._keys_at + i * _KEY.size)
+        return self._buf[off:off + length], rec
+
+    def record(self, i: int) -> SymbolRecord:
+        off, length = _RECORD.unpack_from(self._buf, self._records_at + i * _RECORD.size)
+        return SymbolRecord._decode(self._buf[off:off + length])
+
+    def records(self) -> Iterator[SymbolRecord]:
+        for i in range(self.n_records):
+            yield self.record(i)
+
+    def lookup(self, query: str) -> Optional[SymbolRecord]:
+        """Exact match on normalized symbol, name, alias or ISIN."""
+        target = normalize_name(query).encode("utf-8")
+        if not target:
+            return None
+        lo, hi = 0, self.n_keys
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key, rec = self._key(mid)
+            if key < target:
+                lo = mid + 1
+            elif key > target:
+                hi = mid
+            else:
+                return self.record(rec)
+        return None
+
+    def close(self) -> None:
+        self._buf.close()
+
+
+def read_listing(path: str, exchange: Optional[str] = None) -> Iterator[SymbolRecord]:
+    """Records from an NSE or BSE listing CSV (format detected from its header)."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        reader.fieldnames = [h.strip() for h in reader.fieldnames or []]
+        if exchange is None:
+            exchange = next((ex for ex, cols in LISTING_COLUMNS.items()
+                             if cols["symbol"] in reader.fieldnames), None)
+        if exchange not in LISTING_COLUMNS:
+            raise ValueError(f"{path}: unrecognised listing columns {reader.fieldnames}")
+        cols = LISTING_COLUMNS[exchange]
+        for row in reader:
+            symbol = (row.get(cols["symbol"]) or "").strip().upper()
+            if symbol:
+                yield SymbolRecord(symbol, (row.get(cols["name"]) or "").strip(),
+                                   (row.get(cols["isin"]) or "").strip().upper(), exchange)
+
+
+def read_aliases(path: str) -> Dict[str, List[str]]:
+    aliases: Dict[str, List[str]] = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.reader(f):
+            if len(row) >= 2 and row[0].strip() and row[0].strip().lower() != "symbol":
+                aliases.setdefault(row[0].strip().upper(), []).append(row[1].strip())
+    return aliases
+
+
+def build_index(records: Iterable[SymbolRecord], path: Optional[str] = None,
+                aliases: Optional[Dict[str, List[str]]] = None) -> int:
+    """Write an index file; earlier records win key collisions (list NSE before BSE)."""
+    path = path or SymbolConfig.INDEX
+    aliases = aliases or {}
+
+    unique: Dict[Tuple[str, str], SymbolRecord] = {}
+    for r in records:
+        if (r.exchange, r.symbol) not in unique:
+            extra = tuple(a for a in aliases.get(r.symbol, []) if a not in r.aliases)
+            unique[(r.exchange, r.symbol)] = SymbolRecord(r.symbol, r.name, r.isin, r.exchange,
+                                                          r.aliases + extra)
+    recs = list(unique.values())
+
+    key_to_rec: Dict[bytes, int] = {}
+    for i, r in enumerate(recs):
+        for key in r.keys():
+            key_to_rec.setdefault(key.encode("utf-8"), i)
+    keys = sorted(key_to_rec.items())
+    encoded = [r._encode() for r in recs]
+
+    strings_at = _HEADER.size + len(keys) * _KEY.size + len(recs) * _RECORD.size
+    out = bytearray(_HEADER.pack(MAGIC, len(recs), len(keys)))
+    strings = bytearray()
+    for key, rec in keys:
+        out += _KEY.pack(strings_at + len(strings), len(key), rec)
+        strings += key
+    for raw in encoded:
+        out += _RECORD.pack(strings_at + len(strings), len(raw))
+        strings += raw
+    out += strings
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(out)
+    os.replace(tmp, path)
+    return len(recs)
+
+
+_index: Optional[SymbolIndex] = None
+_index_lock = threading.Lock()
+
+
+def default_index() -> Optional[SymbolIndex]:
+    """The index at SymbolConfig.INDEX, or None when it has not been built."""
+    global _index
+    with _index_lock:
+        if _index is not None and _index.path == SymbolConfig.INDEX:
+            return _index
+        try:
+            _index = SymbolIndex(SymbolConfig.INDEX)
+        except (OSError, ValueError):
+            _index = None
+        return _index
+
+
+def lookup(query: str, exchange: Optional[str] = None) -> Optional[SymbolRecord]:
+    index = default_index()
+    if index is None or not query:
+        return None
+    record = index.lookup(query)
+    if record and exchange and record.exchange != exchange:
+        return None
+    return record
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline symbol master")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="index NSE/BSE listing CSVs (NSE first)")
+    build.add_argument("listings", nargs="+")
+    build.add_argument("--aliases")
+    build.add_argument("--out", default=SymbolConfig.INDEX)
+    find = sub.add_parser("lookup")
+    find.add_argument("query")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        records = [r for p in args.listings for r in read_listing(p)]
+        n = build_index(records, args.out, read_aliases(args.aliases) if args.aliases else None)
+        print(f"📇 Indexed {n} companies → {args.out}")
+    else:
+        print(lookup(args.query) or "not found")
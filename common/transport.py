@@ -0,0 +1,140 @@
+"""Pooled keep-alive HTTP transport used by every fetcher in the project.
+
+All network calls go through ``get`` so connections (and their TLS sessions)
+are reused across requests to the same host instead of reopened each time.
+"""
+import sqlite3
+import threading
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from common import archive, cache, ratelimit, replay
+from common.config import ArchiveConfig, HttpConfig
+
+Timeout = Union[float, Tuple[float, float]]
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update(HttpConfig.HEADERS)
+    retry = Retry(
+        total=HttpConfig.MAX_RETRIES,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HttpConfig.POOL_CONNECTIONS,
+        pool_maxsize=HttpConfig.POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def configure(pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None,
+              headers: Optional[Dict[str, str]] = None, timeout: Optional[Timeout] = None) -> None:
+    """Override pool sizes, default headers or the default timeout and rebuild the session."""
+    if pool_connections is not None:
+        HttpConfig.POOL_CONNECTIONS = pool_connections
+    if pool_maxsize is not None:
+        HttpConfig.POOL_MAXSIZE = pool_maxsize
+    if headers is not None:
+        HttpConfig.HEADERS = dict(headers)
+    if timeout is not None:
+        HttpConfig.TIMEOUT = timeout
+    close()
+
+
+def close() -> None:
+    """Close all pooled connections; the next request opens a fresh session."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def timeout_for(url: str) -> Timeout:
+    """Timeout configured for the host of ``url`` (falls back to HttpConfig.TIMEOUT)."""
+    host = urlsplit(url).hostname or ""
+    return HttpConfig.HOST_TIMEOUTS.get(host, HttpConfig.TIMEOUT)
+
+
+def _archiving(url: str) -> bool:
+    # stand-in replies may be fallback pages for another URL; never archive them
+    return ArchiveConfig.ENABLED and not HttpConfig.STANDIN_URL and archive.should_archive(url)
+
+
+def _archive(url: str, response: requests.Response, only_if_new: bool = False) -> None:
+    store = archive.store_if_new if only_if_new else archive.store
+    try:
+        store(url, response.content, response.headers.get("Content-Type", ""))
+    except (OSError, sqlite3.Error):
+        pass  # the archive is best-effort; never fail a fetch over it
+
+
+def _send(url: str, params: Optional[Dict] = None, headers: Optional[Dict[str, str]] = None,
+          timeout: Optional[Timeout] = None, ticket: Optional[ratelimit.Ticket] = None,
+          **kwargs) -> requests.Response:
+    ratelimit.acquire(url, ticket)
+    if timeout is None:
+        timeout = timeout_for(url)
+    archive_it = _archiving(url)
+    if not (HttpConfig.STANDIN_URL or HttpConfig.RECORD_DIR or archive_it):
+        return get_session().get(url, params=params, headers=headers, timeout=timeout, **kwargs)
+
+    upstream_url = replay.full_url(url, params)
+    target = replay.rewrite(upstream_url) if HttpConfig.STANDIN_URL else upstream_url
+    response = get_session().get(target, headers=headers, timeout=timeout, **kwargs)
+    if HttpConfig.RECORD_DIR and response.status_code != 304:
+        replay.record(upstream_url, response)
+    if archive_it and response.status_code == 200:
+        _archive(upstream_url, response)
+    return response
+
+
+def get(url: str, params: Optional[Dict] = None, headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Timeout] = None, use_cache: bool = True,
+        force_refresh: Optional[bool] = None, ticket: Optional[ratelimit.Ticket] = None,
+        **kwargs) -> requests.Response:
+    """GET ``url`` through the shared pooled session.
+
+    Hosts listed in ``HttpConfig.CACHE_TTL`` are served from the on-disk
+    response cache when possible; pass ``use_cache=False`` to bypass it or
+    ``force_refresh=True`` to re-download and overwrite the cached copy. The
+    cache is bypassed entirely while a stand-in server or recording is active.
+    A request with a ``ticket`` raises ``ratelimit.Cancelled`` instead of being
+    sent if the ticket is cancelled first (including while it waits for a
+    rate-limit token).
+    """
+    # Stand-in replies (possibly a fallback page for another URL) must never be
+    # cached under the upstream URL, and record mode has to see every response
+    replaying = HttpConfig.STANDIN_URL or HttpConfig.RECORD_DIR
+    ttl = cache.ttl_for(url) if use_cache and not replaying else 0
+    if ttl > 0:
+        response = cache.cached_get(_send, url, params=params, headers=headers, ttl=ttl,
+                                    force_refresh=force_refresh, timeout=timeout, ticket=ticket, **kwargs)
+        # cache hits never reach _send, so archive their body unless it already is
+        if response.status_code == 200 and _archiving(url):
+            _archive(replay.full_url(url, params), response, only_if_new=True)
+        return response
+    return _send(url, params=params, headers=headers, timeout=timeout, ticket=ticket, **kwargs)
@@ -1,10 +1,18 @@
+import os
 import re
+import sys
 import json
-import requests
-from bs4 import BeautifulSoup
-from difflib import get_close_matches
 from collections import defaultdict
+from difflib import SequenceMatcher
 from math import pow
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import archive, symbols, transport
+from common.config import HttpConfig
+from common.fuzzy import TrigramIndex
+from common.numeric import coerce_cells, to_float
+from common.screener import archived_company_pages, company_url, parse_screener_html
 
 # ---------------- SYMBOL MAP ----------------
 company_symbols = {
@@ -14,21 +22,55 @@ company_symbols = {
     "HDFC BANK": "HDFCBANK"
 }
 
+FUZZY_CUTOFF = 0.6   # difflib ratio, as with get_close_matches
+FUZZY_SHORTLIST = 20  # trigram candidates re-ranked by ratio
+
+_name_index = None
+_name_symbols = {}
+
+def name_index():
+    """Trigram index over company_symbols plus every NSE name and alias in the symbol master."""
+    global _name_index
+    if _name_index is None:
+        entries = list(company_symbols.items())
+        master = symbols.default_index()
+        if master is not None:
+            # Screener company URLs take NSE symbols; BSE security ids are not recognised
+            for record in master.records():
+                if record.exchange == "NSE":
+                    entries += [(n, record.symbol) for n in (record.name,) + record.aliases]
+        for name, symbol in entries:
+            _name_symbols.setdefault(symbols.normalize_name(name), symbol)
+        _name_index = TrigramIndex(name for name, _ in entries)
+    return _name_index
+
+def find_symbol_candidates(name, k=5):
+    """Top-k (symbol, matched name, score) guesses for a misspelt or partial name.
+
+    The trigram index only shortlists names; they are ranked by difflib ratio
+    (Dice scores run much lower on short names and transpositions). The
+    hand-written company_symbols are always in the running.
+    """
+    query = symbols.normalize_name(name)
+    shortlist = {match for match, _ in name_index().search(name, max(k, FUZZY_SHORTLIST))}
+    shortlist.update(symbols.normalize_name(n) for n in company_symbols)
+    scored = [(SequenceMatcher(None, query, match).ratio(), match) for match in shortlist]
+    scored.sort(key=lambda s: (-s[0], s[1]))
+    return [(_name_symbols[match], match, round(score, 4)) for score, match in scored[:k]]
+
 def find_best_symbol(name):
     name = name.upper()
     if name in company_symbols:
         return company_symbols[name]
-    match = get_close_matches(name, company_symbols.keys(), n=1, cutoff=0.6)
-    return company_symbols.get(match[0], name) if match else name
+    record = symbols.lookup(name, exchange="NSE")
+    if record:
+        return record.symbol
+    match = find_symbol_candidates(name, k=1)
+    return match[0][0] if match and match[0][2] >= FUZZY_CUTOFF else name
 
 # ---------------- HELPERS ----------------
 def safe_num(v):
-    if v is None:
-        return None
-    try:
-        return float(v.replace(",", "").replace("%", ""))
-    except:
-        return None
+    return to_float(v)
 
 def cagr(start, end, years):
     if not start or not end or years <= 0:
@@ -52,46 +94,65 @@ def normalize_ratio_name(name):
 def parse_table(table):
     if not table:
         return {}
-    headers = [h.get_text(strip=True) for h in table.select("thead th")]
-    years = headers[1:]
+    years = table.headers[1:]
     data = defaultdict(dict)
 
-    for row in table.select("tbody tr"):
-        cols = [c.get_text(strip=True) for c in row.find_all(["th", "td"])]
+    for cols in table.rows:
         metric = cols[0]
         for i, y in enumerate(years):
             if i + 1 < len(cols):
                 data[y][metric] = cols[i + 1]
     return data
 
+def parse_numeric_table(table):
+    """Like parse_table, but every cell converted to float (None when missing) in one pass."""
+    if not table:
+        return defaultdict(dict)
+    years = table.headers[1:]
+    grid = coerce_cells([cols[1:] for cols in table.rows], len(years))
+    data = defaultdict(dict)
+
+    for cols, values, missing in zip(table.rows, grid.values, grid.missing):
+        metric = cols[0]
+        for i, y in enumerate(years):
+            if i + 1 < len(cols):
+                data[y][metric] = None if missing[i] else float(values[i])
+    return data
+
 # ---------------- TOP RATIOS ----------------
-def parse_top_ratios(soup):
+def parse_top_ratios(page):
     ratios = {}
-    for li in soup.select("#top-ratios li"):
-        name_tag = li.select_one(".name")
-        value_tag = li.select_one(".value")
-        if name_tag and value_tag:
-            ratios[normalize_ratio_name(name_tag.get_text(strip=True))] = value_tag.get_text(strip=True)
+    for name, value in page.top_ratios:
+        ratios[normalize_ratio_name(name)] = value
     return ratios
 
 # ---------------- MAIN SCRAPER ----------------
-def scrape_screener(symbol):
-    url = f"https://www.screener.in/company/{symbol}/consolidated/"
-    soup = BeautifulSoup(
-        requests.get(url, headers={"User-Agent": "Mozilla/5.0"}).text,
-        "html.parser"
-    )
+def scrape_screener(symbol, reparse=False):
+    url = company_url(symbol)
+    if reparse:
+        # rebuild from the raw page archive, no network
+        markup = archive.latest_body(url)
+        if markup is None:
+            raise ValueError(f"No archived Screener page for {symbol}")
+    else:
+        markup = transport.get(url).content
+    return build_screener_timeline(markup, symbol)
+
+TIMELINE_SECTIONS = ("profit-loss", "ratios", "shareholding")
 
-    company_tag = soup.select_one("div.company-nav h1")
-    company = company_tag.get_text(strip=True) if company_tag else symbol
+def build_screener_timeline(markup, symbol):
+    page = parse_screener_html(markup, TIMELINE_SECTIONS)
 
-    pl = parse_table(soup.select_one("#profit-loss table"))
-    ratios = parse_table(soup.select_one("#ratios table"))
-    shareholding = parse_table(soup.select_one("#shareholding table"))
-    top_ratios = parse_top_ratios(soup)
+    company = page.nav_title or symbol
 
-    pros = [p.get_text(strip=True) for p in soup.select("div.pros li")]
-    cons = [c.get_text(strip=True) for c in soup.select("div.cons li")]
+    pl = parse_table(page.table("profit-loss"))
+    pl_num = parse_numeric_table(page.table("profit-loss"))
+    ratios = parse_numeric_table(page.table("ratios"))
+    shareholding = parse_numeric_table(page.table("shareholding"))
+    top_ratios = parse_top_ratios(page)
+
+    pros = page.pros
+    cons = page.cons
 
     timeline = {}
     years = sorted(pl.keys())
@@ -113,17 +174,17 @@ def scrape_screener(symbol):
                 ]
             },
             "efficiency_risk_ratios": {
-                "ROCE %": safe_num(ratios[y].get("ROCE %")),
-                "ROE %": safe_num(ratios[y].get("ROE")),
-                "Debt to Equity": safe_num(ratios[y].get("Debt to Equity")),
-                "Interest Coverage": safe_num(ratios[y].get("Interest Coverage")),
-                "Working Capital Days": safe_num(ratios[y].get("Working Capital Days"))
+                "ROCE %": ratios[y].get("ROCE %"),
+                "ROE %": ratios[y].get("ROE"),
+                "Debt to Equity": ratios[y].get("Debt to Equity"),
+                "Interest Coverage": ratios[y].get("Interest Coverage"),
+                "Working Capital Days": ratios[y].get("Working Capital Days")
             },
             "shareholding_intelligence": {
-                "Promoters %": safe_num(shareholding[y].get("Promoters")),
-                "FII %": safe_num(shareholding[y].get("Foreign Institutions")),
-                "DII %": safe_num(shareholding[y].get("Domestic Institutions")),
-                "Public %": safe_num(shareholding[y].get("Public"))
+                "Promoters %": shareholding[y].get("Promoters"),
+                "FII %": shareholding[y].get("Foreign Institutions"),
+                "DII %": shareholding[y].get("Domestic Institutions"),
+                "Public %": shareholding[y].get("Public")
             },
             "growth_metrics": {},
             "qualitative_analysis": {
@@ -147,9 +208,9 @@ def scrape_screener(symbol):
         y0, y1 = years[0], years[-1]
         n = len(years) - 1
         timeline[y1]["growth_metrics"] = {
-            "Sales CAGR %": cagr(safe_num(pl[y0].get("Sales+")), safe_num(pl[y1].get("Sales+")), n),
-            "Profit CAGR %": cagr(safe_num(pl[y0].get("Net Profit+")), safe_num(pl[y1].get("Net Profit+")), n),
-            "EPS CAGR %": cagr(safe_num(pl[y0].get("EPS in Rs")), safe_num(pl[y1].get("EPS in Rs")), n)
+            "Sales CAGR %": cagr(pl_num[y0].get("Sales+"), pl_num[y1].get("Sales+"), n),
+            "Profit CAGR %": cagr(pl_num[y0].get("Net Profit+"), pl_num[y1].get("Net Profit+"), n),
+            "EPS CAGR %": cagr(pl_num[y0].get("EPS in Rs"), pl_num[y1].get("EPS in Rs"), n)
         }
 
     return {
@@ -158,14 +219,41 @@ def scrape_screener(symbol):
         "timeline_fundamentals": timeline
     }
 
+# ---------------- REPARSE ----------------
+def save_timeline(symbol, data):
+    with open(f"screener_timeline_{symbol}.json", "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+def reparse_archived_page(page):
+    symbol, sha = page
+    try:
+        save_timeline(symbol, build_screener_timeline(archive.load(sha), symbol))
+        return symbol, None
+    except Exception as e:
+        return symbol, str(e)
+
+def reparse_all():
+    """Rebuild every screener_timeline_<symbol>.json from the archive on all cores."""
+    with ProcessPoolExecutor() as pool:
+        return list(pool.map(reparse_archived_page, archived_company_pages(), chunksize=8))
+
 # ---------------- DRIVER ----------------
 if __name__ == "__main__":
+    if "--refresh" in sys.argv:
+        HttpConfig.CACHE_FORCE_REFRESH = True
+    if "--reparse" in sys.argv:
+        results = reparse_all()
+        for symbol, error in results:
+            if error:
+                print(f"⚠ {symbol}: {error}")
+        print(f"✅ Rebuilt {sum(1 for _, e in results if not e)} timelines from the archive")
+        sys.exit(0)
+
     name = input("Enter company name or symbol: ")
     symbol = find_best_symbol(name)
     print(f"🔍 Scraping Screener → {symbol}")
     data = scrape_screener(symbol)
 
-    with open(f"screener_timeline_{symbol}.json", "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    save_timeline(symbol, data)
 
     print("✅ Screener data scraped successfully (ML-ready, no null confusion)")
@@ -1,12 +1,31 @@
-import requests
-from bs4 import BeautifulSoup
+import os
+import re
+import sys
+import threading
+import time
 from youtube_comment_downloader import YoutubeCommentDownloader
-import feedparser
 import pandas as pd
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import transport
+from common.config import STATE_DIR
+from common.fanout import SharedBudget, gather_with_deadlines
+from common.hedge import InstanceHealth, hedged_race
+from common.htmlparse import select_texts
+from common.rss import parse_feed
+from common.sanitize import sanitize_html
+
 analyzer = SentimentIntensityAnalyzer()
 
+# Seconds each source may take before run() moves on with what it has
+SOURCE_DEADLINES = {
+    "twitter": 15,
+    "youtube": 20,
+    "news": 10,
+    "hackernews": 10,
+}
+
 
 # -------------------------------------------
 # Helper: Sentiment Score
@@ -18,82 +37,114 @@ def get_sentiment(text):
 # -------------------------------------------
 # 1. TWITTER USING NITTER (Python 3.14 safe)
 # -------------------------------------------
-def fetch_twitter(company, limit=150):
-    nitter_instances = [
-        "https://nitter.net",
-        "https://nitter.privacydev.net",
-        "https://nitter.lacontrevoie.fr"
-    ]
-
-    tweets = []
-    for instance in nitter_instances:
-        try:
-            url = f"{instance}/search?f=tweets&q={company}"
-            html = requests.get(url, timeout=10).text
-            soup = BeautifulSoup(html, "html.parser")
-
-            for tweet in soup.select(".tweet-content"):
-                if len(tweets) >= limit:
-                    return tweets
-                tweets.append(tweet.get_text(strip=True))
-
-            if tweets:
-                return tweets
-        except:
-            continue
-
+NITTER_INSTANCES = [
+    "https://nitter.net",
+    "https://nitter.privacydev.net",
+    "https://nitter.lacontrevoie.fr"
+]
+NITTER_HEDGE_DELAY = 1.5  # seconds before racing the next instance
+nitter_health = InstanceHealth(os.path.join(STATE_DIR, "nitter_health.json"))
+
+
+def fetch_nitter_instance(instance, company, limit=150):
+    url = f"{instance}/search?f=tweets&q={company}"
+    return select_texts(transport.get(url).content, ".tweet-content", limit)
+
+
+def fetch_twitter(company, limit=150, out=None):
+    tweets = out if out is not None else []
+
+    # healthiest instance first; slower or failing ones get raced by the next
+    winner = hedged_race(
+        nitter_health.ranked(NITTER_INSTANCES),
+        lambda instance: fetch_nitter_instance(instance, company, limit),
+        NITTER_HEDGE_DELAY,
+        health=nitter_health,
+    )
+    tweets.extend(winner or [])
     return tweets
 
 
 # -------------------------------------------
 # 2. YOUTUBE COMMENTS
 # -------------------------------------------
-def fetch_youtube_comments(company, limit=150):
-    try:
-        search_url = f"https://www.youtube.com/results?search_query={company}+review"
-        html = requests.get(search_url).text
+YOUTUBE_VIDEOS = 3  # top search results to pull comments from
+VIDEO_ID_RE = re.compile(r'(?:watch\?v=|"videoId":")([\w-]{11})')
 
-        idx = html.find("watch?v=")
-        if idx == -1:
-            return []
 
-        video_id = html[idx + 8 : idx + 19]
-        video_url = f"https://www.youtube.com/watch?v={video_id}"
+def find_video_ids(html, n=YOUTUBE_VIDEOS):
+    return list(dict.fromkeys(VIDEO_ID_RE.findall(html)))[:n]
 
-        downloader = YoutubeCommentDownloader()
-        gen = downloader.get_comments_from_url(video_url)
 
-        comments = []
-        for i, c in enumerate(gen):
-            if i >= limit:
+def stream_video_comments(video_id, budget, comments):
+    downloader = YoutubeCommentDownloader()
+    gen = downloader.get_comments_from_url(f"https://www.youtube.com/watch?v={video_id}")
+    try:
+        for c in gen:
+            if not budget.take():
                 break
             comments.append(c["text"])
+    except Exception:
+        pass
+
+
+def fetch_youtube_comments(company, limit=150, out=None, videos=YOUTUBE_VIDEOS):
+    comments = out if out is not None else []
+    try:
+        search_url = f"https://www.youtube.com/results?search_query={company}+review"
+        html = transport.get(search_url).text
+
+        video_ids = find_video_ids(html, videos)
+        if not video_ids:
+            return comments
+
+        # all videos stream at once; collection stops when the shared budget runs out.
+        # Daemon threads: the downloader has no timeout, so a stalled stream must
+        # not keep the process alive after run() has moved on
+        budget = SharedBudget(limit)
+        threads = [
+            threading.Thread(target=stream_video_comments, args=(video_id, budget, comments),
+                             name=f"youtube-{video_id}", daemon=True)
+            for video_id in video_ids
+        ]
+        for t in threads:
+            t.start()
+        deadline = time.monotonic() + SOURCE_DEADLINES["youtube"]
+        for t in threads:
+            t.join(max(0.0, deadline - time.monotonic()))
 
         return comments
     except:
-        return []
+        return comments
 
 
 # -------------------------------------------
 # 3. GOOGLE NEWS
 # -------------------------------------------
-def fetch_google_news(company, limit=40):
+def fetch_google_news(company, limit=40, out=None):
+    items = out if out is not None else []
     url = f"https://news.google.com/rss/search?q={company}"
-    feed = feedparser.parse(url)
+    try:
+        body = transport.get(url).content
+    except Exception:
+        return items
 
-    return [(entry.title + " " + entry.summary) for entry in feed.entries[:limit]]
+    items.extend((entry["title"] + " " + entry["summary"]) for entry in parse_feed(body, limit))
+    return items
 
 
 # -------------------------------------------
 # 4. HACKER NEWS
 # -------------------------------------------
-def fetch_hackernews(company):
+def fetch_hackernews(company, out=None):
+    items = out if out is not None else []
     try:
         url = f"https://hn.algolia.com/api/v1/search?query={company}"
-        data = requests.get(url).json()
-        return [hit["title"] or "" for hit in data["hits"]]
+        data = transport.get(url).json()
+        items.extend(hit["title"] or "" for hit in data["hits"])
     except:
-        return []
+        pass
+    return items
 
 
 # -------------------------------------------
@@ -102,28 +153,41 @@ def fetch_hackernews(company):
 def run(company):
     print(f"🔍 Collecting data for: {company}")
 
-    data = {
-        "twitter": fetch_twitter(company),
-        "youtube": fetch_youtube_comments(company),
-        "news": fetch_google_news(company),
-        "hackernews": fetch_hackernews(company),
-    }
+    # All sources run at once; a slow source only costs its own deadline
+    data, timed_out = gather_with_deadlines({
+        "twitter": (lambda out: fetch_twitter(company, out=out), SOURCE_DEADLINES["twitter"]),
+        "youtube": (lambda out: fetch_youtube_comments(company, out=out), SOURCE_DEADLINES["youtube"]),
+        "news": (lambda out: fetch_google_news(company, out=out), SOURCE_DEADLINES["news"]),
+        "hackernews": (lambda out: fetch_hackernews(company, out=out), SOURCE_DEADLINES["hackernews"]),
+    })
 
     all_rows = []
+    seen = set()  # news headlines already kept
 
     for source, items in data.items():
-        print(f"✔ {source}: {len(items)}")
-
-        for text in items:
+        status = " (timed out, partial)" if source in timed_out else ""
+        print(f"✔ {source}: {len(items)}{status}")
+
+        for raw in items:
+            # strip markup before scoring; links are kept in their own column
+            text, urls = sanitize_html(raw)
+            if not text:
+                continue
+            if source == "news":
+                # the same syndicated headline shows up once per outlet
+                if text in seen:
+                    continue
+                seen.add(text)
             all_rows.append({
                 "source": source,
                 "text": text,
+                "urls": " ".join(urls),
                 "sentiment": get_sentiment(text)
             })
 
     if not all_rows:
         print("\n❌ No data collected.")
-        return
+        return timed_out
 
     df = pd.DataFrame(all_rows)
 
@@ -138,6 +202,10 @@ def run(company):
 
     final_score = df["sentiment"].mean()
     print(f"\n📊 FINAL SENTIMENT SCORE for {company}: {round(final_score, 3)}")
+    if timed_out:
+        print(f"⏱ Sources past their deadline: {', '.join(timed_out)}")
+
+    return timed_out
 
 
 # -------------------------------------------
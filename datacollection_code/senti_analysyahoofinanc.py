@@ -1,12 +1,32 @@
-import requests
-import feedparser
+import os
+import sys
+import asyncio
 import pandas as pd
-from bs4 import BeautifulSoup
 from datetime import datetime
+from functools import lru_cache
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import aio, symbols, transport
+from common.htmlparse import select_texts
+from common.mentions import AliasMatcher
+from common.rss import iter_feed_entries
 
 # -------------------------------------------------
 # COMPANY RESOLUTION
 # -------------------------------------------------
+COMPANY_MAP = {
+    "TCS": ("Tata Consultancy Services", "TCS.NS", ["tcs", "tata consultancy"]),
+    "INFOSYS": ("Infosys", "INFY.NS", ["infosys"]),
+    "RELIANCE": ("Reliance Industries", "RELIANCE.NS", ["reliance"]),
+    "HDFC BANK": ("HDFC Bank", "HDFCBANK.NS", ["hdfc"]),
+    "APPLE": ("Apple Inc", "AAPL", ["apple"]),
+    "MICROSOFT": ("Microsoft", "MSFT", ["microsoft"]),
+    "GOOGLE": ("Alphabet", "GOOGL", ["google", "alphabet"]),
+    "AMAZON": ("Amazon", "AMZN", ["amazon"]),
+    "TESLA": ("Tesla", "TSLA", ["tesla"])
+}
+
+
 def resolve_company(company_input):
     """
     Returns:
@@ -14,21 +34,15 @@ def resolve_company(company_input):
     ticker       → for Yahoo Finance RSS
     aliases      → for safe matching
     """
-    company_map = {
-        "TCS": ("Tata Consultancy Services", "TCS.NS", ["tcs", "tata consultancy"]),
-        "INFOSYS": ("Infosys", "INFY.NS", ["infosys"]),
-        "RELIANCE": ("Reliance Industries", "RELIANCE.NS", ["reliance"]),
-        "HDFC BANK": ("HDFC Bank", "HDFCBANK.NS", ["hdfc"]),
-        "APPLE": ("Apple Inc", "AAPL", ["apple"]),
-        "MICROSOFT": ("Microsoft", "MSFT", ["microsoft"]),
-        "GOOGLE": ("Alphabet", "GOOGL", ["google", "alphabet"]),
-        "AMAZON": ("Amazon", "AMZN", ["amazon"]),
-        "TESLA": ("Tesla", "TSLA", ["tesla"])
-    }
-
     key = company_input.upper().strip()
-    if key in company_map:
-        return company_map[key]
+    if key in COMPANY_MAP:
+        return COMPANY_MAP[key]
+
+    # local exchange listing (python -m common.symbols build ...)
+    record = symbols.lookup(company_input)
+    if record:
+        aliases = [symbols.normalize_name(record.name), record.name.lower()] + [a.lower() for a in record.aliases]
+        return record.name, record.ticker, list(dict.fromkeys(aliases))
 
     # fallback → user-defined company
     return company_input, company_input, [company_input.lower()]
@@ -37,24 +51,26 @@ def resolve_company(company_input):
 # -------------------------------------------------
 # SMART COMPANY FILTER (BALANCED)
 # -------------------------------------------------
-def is_valid_company_news(text, company_name, aliases):
-    text = text.lower()
+@lru_cache(maxsize=1024)
+def company_matcher(company_name, aliases):
+    return AliasMatcher({company_name: (company_name,) + aliases})
 
-    # must contain company name or alias
-    if company_name.lower() in text:
-        return True
 
-    for a in aliases:
-        if a in text:
-            return True
+def watchlist_matcher(companies):
+    """One automaton over every resolved company's name and aliases."""
+    return AliasMatcher({name: [name] + aliases for name, _, aliases in companies})
 
-    return False
+
+def is_valid_company_news(text, company_name, aliases, matcher=None):
+    # must contain company name or alias as whole words
+    matcher = matcher or company_matcher(company_name, tuple(aliases))
+    return company_name in matcher.mentions(text)
 
 
 # -------------------------------------------------
 # YAHOO FINANCE NEWS (PRIMARY SOURCE)
 # -------------------------------------------------
-def fetch_yahoo_news(company_name, ticker, aliases, limit=60):
+def fetch_yahoo_news(company_name, ticker, aliases, limit=60, matcher=None):
     news = []
 
     url = (
@@ -62,27 +78,34 @@ def fetch_yahoo_news(company_name, ticker, aliases, limit=60):
         f"?s={ticker}&region=US&lang=en-US"
     )
 
-    feed = feedparser.parse(url)
+    try:
+        body = transport.get(url).content
+    except Exception:
+        return news
 
-    for entry in feed.entries:
+    # entries are parsed lazily; we stop reading the feed once the limit is hit
+    for entry in iter_feed_entries(body):
         if len(news) >= limit:
             break
 
-        title = entry.title
-        summary = entry.summary if hasattr(entry, "summary") else ""
+        title = entry["title"]
+        summary = entry["summary"]
         full_text = f"{title} {summary}"
 
-        if not is_valid_company_news(full_text, company_name, aliases):
+        if not is_valid_company_news(full_text, company_name, aliases, matcher):
             continue
 
-        news.append({
+        item = {
             "company": company_name,
             "source": "Yahoo Finance",
             "title": title,
             "summary": summary,
-            "published": entry.published if hasattr(entry, "published") else "",
+            "published": entry["published"],
             "collected_at": datetime.utcnow().isoformat()
-        })
+        }
+        if matcher is not None:
+            item["mentions"] = "; ".join(matcher.mentions(full_text))
+        news.append(item)
 
     return news
 
@@ -90,33 +113,32 @@ def fetch_yahoo_news(company_name, ticker, aliases, limit=60):
 # -------------------------------------------------
 # SEEKING ALPHA (HEADLINES ONLY – SAFE MODE)
 # -------------------------------------------------
-def fetch_seeking_alpha(company_name, aliases, limit=30):
+def fetch_seeking_alpha(company_name, aliases, limit=30, matcher=None):
     news = []
 
     url = f"https://seekingalpha.com/search?q={company_name}"
-    headers = {"User-Agent": "Mozilla/5.0"}
 
     try:
-        html = requests.get(url, headers=headers, timeout=10).text
-        soup = BeautifulSoup(html, "html.parser")
+        html = transport.get(url).content
 
-        for tag in soup.select("a[data-test-id='post-list-item-title']"):
+        for title in select_texts(html, "a[data-test-id='post-list-item-title']"):
             if len(news) >= limit:
                 break
 
-            title = tag.get_text(strip=True)
-
-            if not is_valid_company_news(title, company_name, aliases):
+            if not is_valid_company_news(title, company_name, aliases, matcher):
                 continue
 
-            news.append({
+            item = {
                 "company": company_name,
                 "source": "Seeking Alpha",
                 "title": title,
                 "summary": "",
                 "published": "",
                 "collected_at": datetime.utcnow().isoformat()
-            })
+            }
+            if matcher is not None:
+                item["mentions"] = "; ".join(matcher.mentions(title))
+            news.append(item)
 
     except:
         pass
@@ -149,9 +171,80 @@ def collect_finance_news(company_input):
     print(f"📁 Saved to: {filename}")
 
 
+# -------------------------------------------------
+# BATCH COLLECTOR
+# -------------------------------------------------
+# Concurrent requests allowed per source host in batch mode
+BATCH_HOST_CONCURRENCY = {
+    "feeds.finance.yahoo.com": 8,
+    "seekingalpha.com": 2,
+}
+BATCH_OUTPUT_FILE = "finance_news_batch.csv"
+
+
+def load_companies(source):
+    """
+    Accepts a list of names, a comma-separated string,
+    a .csv file with a 'Company' column or a text file with one name per line.
+    """
+    if isinstance(source, (list, tuple)):
+        return [str(c).strip() for c in source if str(c).strip()]
+
+    if source.endswith(".csv"):
+        df = pd.read_csv(source)
+        return [str(c).strip() for c in df["Company"].dropna()]
+
+    if os.path.isfile(source):
+        with open(source, "r", encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+
+    return [c.strip() for c in source.split(",") if c.strip()]
+
+
+async def _collect_batch_async(companies):
+    limiter = aio.HostLimiter(BATCH_HOST_CONCURRENCY)
+    resolved = [resolve_company(c) for c in companies]
+    # every article is scanned once for all watched companies
+    matcher = watchlist_matcher(resolved)
+    tasks = []
+
+    # one task per (company, source) pair, capped per host
+    for company_name, ticker, aliases in resolved:
+        tasks.append(aio.call(limiter, "feeds.finance.yahoo.com",
+                              fetch_yahoo_news, company_name, ticker, aliases, 60, matcher))
+        tasks.append(aio.call(limiter, "seekingalpha.com",
+                              fetch_seeking_alpha, company_name, aliases, 30, matcher))
+
+    results = await asyncio.gather(*tasks)
+    return [item for items in results for item in items]
+
+
+def collect_finance_news_batch(companies, output_file=BATCH_OUTPUT_FILE):
+    companies = list(dict.fromkeys(load_companies(companies)))
+
+    print(f"🔍 Collecting finance news for {len(companies)} companies")
+
+    data = aio.run(_collect_batch_async(companies),
+                   max_workers=sum(BATCH_HOST_CONCURRENCY.values()))
+
+    if not data:
+        print("❌ No news collected.")
+        return
+
+    df = pd.DataFrame(data)
+    df.to_csv(output_file, index=False, encoding="utf-8")
+
+    print(f"✅ Collected {len(df)} articles across {df['company'].nunique()} companies")
+    print(f"📁 Saved to: {output_file}")
+
+
 # -------------------------------------------------
 # RUN
 # -------------------------------------------------
 if __name__ == "__main__":
-    company = input("Enter company name: ").strip()
-    collect_finance_news(company)
+    # python senti_analysyahoofinanc.py companies.txt | companies.csv | "TCS,INFOSYS"
+    if len(sys.argv) > 1:
+        collect_finance_news_batch(sys.argv[1])
+    else:
+        company = input("Enter company name: ").strip()
+        collect_finance_news(company)
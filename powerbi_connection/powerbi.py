@@ -1,23 +1,49 @@
 
 
-import requests
+import csv
+import hashlib
+import io
+import os
+import asyncio
 import pandas as pd
 import sys
 import re
-import time
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from functools import lru_cache, partial
+from itertools import chain
+from typing import Dict, List, NamedTuple, Tuple, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import aio, archive, ratelimit, resolutions, symbols, transport
+from common.config import HttpConfig
+from common.fanout import first_in_priority
+from common.numeric import clean_value, coerce_cells
+from common.resultcache import ResultCache, content_key
+from common.screener import ScreenerTable, archived_company_pages, company_url, parse_screener_html
 
 # ==================== CONFIGURATION ====================
 class Config:
     OUTPUT_FILE = "powerbi_inputs.csv"
     SOURCE = "Screener.in"
     MAX_YEARS = 6
-    REQUEST_DELAY = 1.0  # Delay between requests
-    HEADERS = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    PARSE_VERSION = 3  # bump whenever parsing/normalization rules change
+    HEADERS = HttpConfig.HEADERS
+    # Async mode: requests in flight per lane, and companies in flight overall
+    HOST_CONCURRENCY = {
+        "yahoo_search": 4,
+        "screener_search": 4,
+        "screener_page": 8,
     }
+    MAX_COMPANIES_IN_FLIGHT = 64
+    RESOLVE_WORKERS = 8  # concurrent symbol lookups in resolve_nse_symbol
+    # Seconds a sent symbol lookup may go unanswered before the next one in
+    # the plan starts anyway (a miss starts the next one immediately)
+    RESOLVE_STAGGER = 1.0
+    METRIC_CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "metric_catalog.csv")
+
+parsed_results = ResultCache()
+_lookup_pool = ThreadPoolExecutor(max_workers=Config.RESOLVE_WORKERS, thread_name_prefix="resolve")
 
 # ==================== INPUT HANDLING ====================
 def get_company_input() -> List[str]:
@@ -39,88 +65,133 @@ def get_company_input() -> List[str]:
     return [x.strip() for x in user_input.split(",")]
 
 # ==================== SYMBOL RESOLUTION ====================
-def resolve_nse_symbol(company_name: str) -> str:
-    """Fully automatic detection of NSE symbol from any company name or keyword."""
+# Common patterns first (fastest)
+COMMON_PATTERNS = {
+    "ambuja": "AMBUJACEM",
+    "tcs": "TCS",
+    "tata consultancy services": "TCS",
+    "infosys": "INFY",
+    "reliance": "RELIANCE",
+    "hdfc bank": "HDFCBANK",
+    "icici bank": "ICICIBANK",
+    "wipro": "WIPRO",
+    "hcl tech": "HCLTECH",
+    "tech mahindra": "TECHM",
+    "axis bank": "AXISBANK",
+    "kotak bank": "KOTAKBANK"
+}
+
+YAHOO_SEARCH_URL = "https://query2.finance.yahoo.com/v1/finance/search"
+SCREENER_SEARCH_URL = "https://www.screener.in/api/company/search/"
+
+def normalize_company_name(company_name: str) -> str:
     if not company_name or not company_name.strip():
         raise ValueError("Company name cannot be empty")
+    return company_name.strip().lower()
 
-    name = company_name.strip().lower()
-    
-    # Common patterns first (fastest)
-    common_patterns = {
-        "ambuja": "AMBUJACEM",
-        "tcs": "TCS",
-        "tata consultancy services": "TCS",
-        "infosys": "INFY",
-        "reliance": "RELIANCE",
-        "hdfc bank": "HDFCBANK",
-        "icici bank": "ICICIBANK",
-        "wipro": "WIPRO",
-        "hcl tech": "HCLTECH",
-        "tech mahindra": "TECHM",
-        "axis bank": "AXISBANK",
-        "kotak bank": "KOTAKBANK"
-    }
-    
-    if name in common_patterns:
-        return common_patterns[name]
-
-    # 1. Try Yahoo Finance
-    yahoo_symbol = search_yahoo_symbol(name)
-    if yahoo_symbol:
-        return yahoo_symbol
+def resolve_nse_symbol(company_name: str) -> str:
+    """Fully automatic detection of NSE symbol from any company name or keyword."""
+    name = normalize_company_name(company_name)
+    symbol = offline_symbol(name) or cached_symbol(name)
+    if symbol:
+        return symbol
 
-    # 2. Try Screener.in search API
-    screener_symbol = search_screener_symbol(name)
-    if screener_symbol:
-        return screener_symbol
+    # Lookups run in priority order, overlapping only when one is slow; the highest-priority hit wins
+    failures: List[str] = []
+    found = first_in_priority(
+        [partial(tagged_search, source, query, failures=failures) for source, query in resolution_plan(name)],
+        _lookup_pool,
+        Config.RESOLVE_STAGGER,
+    )
+    return remember_symbol(name, found, complete=not failures)
 
-    # 3. Try partial name search (split by space)
-    for token in name.split():
-        yahoo_symbol = search_yahoo_symbol(token)
-        if yahoo_symbol:
-            return yahoo_symbol
+def cached_symbol(name: str) -> str:
+    """Answer from an earlier run; a cached miss goes straight to the fallback."""
+    cached = resolutions.get(name)
+    if cached is None:
+        return ""
+    return cached.symbol or generate_symbol_fallback(name)
 
-        screener_symbol = search_screener_symbol(token)
-        if screener_symbol:
-            return screener_symbol
+def remember_symbol(name: str, found: Optional[Tuple[str, str]], complete: bool) -> str:
+    """Persist a (source, symbol) search result and return the symbol to use.
 
+    A miss is only remembered when ``complete``, i.e. every lookup got an
+    answer; after an outage, timeout or 429 the name is searched again next run.
+    """
+    if found:
+        source, symbol = found
+        resolutions.put(name, symbol, source)
+        return symbol
+    if complete:
+        resolutions.put(name, None, "miss")
     # 4. Last-resort fallback
     return generate_symbol_fallback(name)
 
-def search_yahoo_symbol(query: str) -> str:
-    """Search Yahoo Finance for NSE symbol."""
-    try:
-        url = "https://query2.finance.yahoo.com/v1/finance/search"
-        params = {"q": query, "quotesCount": 10, "newsCount": 0}
-        time.sleep(Config.REQUEST_DELAY)
-        r = requests.get(url, params=params, headers=Config.HEADERS, timeout=10)
-        r.raise_for_status()
-        data = r.json()
-        for q in data.get("quotes", []):
-            symbol = q.get("symbol", "")
-            exch = q.get("exchange", "")
-            if symbol.endswith(".NS") or exch == "NSI":
-                return symbol.replace(".NS", "")
-    except Exception:
-        pass
+def offline_symbol(name: str) -> str:
+    """Common patterns, then the local NSE symbol master (no network)."""
+    if name in COMMON_PATTERNS:
+        return COMMON_PATTERNS[name]
+    record = symbols.lookup(name, exchange="NSE")
+    return record.symbol if record else ""
+
+def resolution_plan(name: str) -> List[Tuple[str, str]]:
+    """Priority-ordered (source, query) lookups used when a name is not known offline."""
+    # 1. Yahoo Finance, 2. Screener.in search API
+    plan = [("yahoo_search", name), ("screener_search", name)]
+    # 3. Partial name search (split by space)
+    for token in name.split():
+        plan.append(("yahoo_search", token))
+        plan.append(("screener_search", token))
+    return list(dict.fromkeys(plan))
+
+def yahoo_search_params(query: str) -> Dict:
+    return {"q": query, "quotesCount": 10, "newsCount": 0}
+
+def parse_yahoo_search(data: Dict) -> str:
+    """Pick the first NSE listing from a Yahoo search response."""
+    for q in data.get("quotes", []):
+        symbol = q.get("symbol", "")
+        exch = q.get("exchange", "")
+        if symbol.endswith(".NS") or exch == "NSI":
+            return symbol.replace(".NS", "")
+    return ""
+
+def parse_screener_search(results) -> str:
+    """Pick the first symbol from a Screener search response."""
+    if isinstance(results, list) and results:
+        symbol = results[0].get("symbol", "")
+        if symbol:
+            return symbol.upper()
     return ""
 
-def search_screener_symbol(query: str) -> str:
-    """Use Screener.in search API to find symbol dynamically."""
+def search_yahoo_symbol(query: str, ticket: Optional[ratelimit.Ticket] = None) -> str:
+    """Search Yahoo Finance for NSE symbol; "" means no match, a failed request raises."""
+    r = transport.get(YAHOO_SEARCH_URL, params=yahoo_search_params(query), ticket=ticket)
+    r.raise_for_status()
+    return parse_yahoo_search(r.json())
+
+def search_screener_symbol(query: str, ticket: Optional[ratelimit.Ticket] = None) -> str:
+    """Use Screener.in search API to find symbol dynamically; a failed request raises."""
+    r = transport.get(SCREENER_SEARCH_URL, params={"q": query}, ticket=ticket)
+    r.raise_for_status()
+    return parse_screener_search(r.json())
+
+SYMBOL_SEARCHES = {
+    "yahoo_search": search_yahoo_symbol,
+    "screener_search": search_screener_symbol,
+}
+
+def tagged_search(source: str, query: str, ticket: ratelimit.Ticket,
+                  failures: List[str]) -> Optional[Tuple[str, str]]:
+    """(source, symbol) on a hit, None on a miss; failed requests are noted in ``failures``."""
     try:
-        url = "https://www.screener.in/api/company/search/"
-        params = {"q": query}
-        r = requests.get(url, params=params, headers=Config.HEADERS, timeout=10)
-        r.raise_for_status()
-        results = r.json()
-        if isinstance(results, list) and results:
-            symbol = results[0].get("symbol", "")
-            if symbol:
-                return symbol.upper()
+        symbol = SYMBOL_SEARCHES[source](query, ticket)
+    except ratelimit.Cancelled:
+        return None
     except Exception:
-        pass
-    return ""
+        failures.append(source)
+        return None
+    return (source, symbol) if symbol else None
 
 def generate_symbol_fallback(name: str) -> str:
     """Fallback: generate symbol from company name."""
@@ -128,54 +199,56 @@ def generate_symbol_fallback(name: str) -> str:
     return name_clean[:7]
 
 # ==================== DATA FETCHING ====================
-def fetch_screener_data(symbol: str) -> Tuple[str, Dict]:
-    """Fetch financial data from Screener.in"""
-    url = f"https://www.screener.in/company/{symbol}/consolidated/"
+STATEMENT_SECTIONS = ("profit-loss", "balance-sheet", "cash-flow", "ratios")
+
+def fetch_screener_page(symbol: str) -> bytes:
+    """Raw Screener.in company page"""
+    url = company_url(symbol)
     try:
-        response = requests.get(url, headers=Config.HEADERS, timeout=20)
+        response = transport.get(url)
         response.raise_for_status()
     except Exception as e:
         raise ValueError(f"Failed to fetch Screener data for {symbol}: {e}")
+    return response.content
+
+def fetch_screener_data(symbol: str) -> Tuple[str, Dict]:
+    """Fetch financial data from Screener.in"""
+    company_name, tables, _ = parse_and_normalize(fetch_screener_page(symbol), symbol)
+    return company_name, tables
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    company_tag = soup.select_one("h1")
-    company_name = company_tag.get_text(strip=True) if company_tag else symbol
+def parse_screener_page(html: bytes, symbol: str) -> Tuple[str, Dict]:
+    """Extract the company name and summary tables from a Screener company page."""
+    page = parse_screener_html(html, STATEMENT_SECTIONS, overview=False)
+    company_name = page.title or symbol
 
     tables = {
-        "Profit & Loss": {"Summary": parse_financial_table(soup.select_one("#profit-loss table"))},
-        "Balance Sheet": {"Summary": parse_financial_table(soup.select_one("#balance-sheet table"))},
-        "Cash Flow": {"Summary": parse_financial_table(soup.select_one("#cash-flow table"))},
-        "Ratios": {"Summary": parse_financial_table(soup.select_one("#ratios table"))},
+        "Profit & Loss": {"Summary": parse_financial_table(page.table("profit-loss"))},
+        "Balance Sheet": {"Summary": parse_financial_table(page.table("balance-sheet"))},
+        "Cash Flow": {"Summary": parse_financial_table(page.table("cash-flow"))},
+        "Ratios": {"Summary": parse_financial_table(page.table("ratios"))},
     }
 
     return company_name, tables
 
-def parse_financial_table(table) -> Dict[str, Dict[str, str]]:
+def parse_financial_table(table: Optional[ScreenerTable]) -> Dict[str, Dict[str, str]]:
     """Parse table into {metric: {year: value}}"""
     if not table:
         return {}
-    headers = [h.get_text(strip=True) for h in table.select("thead th")]
+    headers = table.headers
     years = [re.search(r"(20\d{2})", h).group(1) for h in headers[1:] if re.search(r"(20\d{2})", h)]
     years = years[-Config.MAX_YEARS:]
 
+    rows = [cols for cols in table.rows if len(cols) >= 2]
+    # one coercion pass over every value cell of the table
+    grid = coerce_cells([cols[1:] for cols in rows], len(years))
+
     data = {}
-    for row in table.select("tbody tr"):
-        cols = [c.get_text(strip=True) for c in row.find_all(["th", "td"])]
-        if len(cols) < 2:
-            continue
-        metric = cols[0]
-        values = cols[1:]
-        data[metric] = {}
-        for i, year in enumerate(years):
-            data[metric][year] = clean_numeric_value(values[i]) if i < len(values) else ""
+    for cols, cleaned in zip(rows, grid.cleaned):
+        data[cols[0]] = dict(zip(years, cleaned))
     return data
 
 def clean_numeric_value(value: str) -> str:
-    if not value or value.strip() in ("", "-", "NA", "N/A"):
-        return ""
-    cleaned = value.strip().replace(",", "").replace("%", "").replace("₹", "").replace("$", "")
-    cleaned = re.sub(r"[^\d.-]", "", cleaned)
-    return cleaned
+    return clean_value(value)
 
 def clean_metric_name(metric: str) -> str:
     if not metric:
@@ -184,76 +257,276 @@ def clean_metric_name(metric: str) -> str:
     return re.sub(r"\s+", " ", cleaned)
 
 # ==================== UNIT INFERENCE ====================
+def catalog_key(metric_name: str) -> str:
+    return clean_metric_name(metric_name).strip().lower()
+
+class MetricInfo(NamedTuple):
+    metric_id: int
+    metric: str
+    unit: str
+    statement: str
+
+def load_metric_catalog(path: str = Config.METRIC_CATALOG) -> Tuple[Dict[str, MetricInfo], str]:
+    """Canonical metrics (unit, statement, ID) keyed by lowercase cleaned name, and a
+    hash of the file so cached results are rebuilt whenever the catalog is edited."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    catalog = {}
+    for row in csv.DictReader(io.StringIO(raw.decode("utf-8"), newline="")):
+        info = MetricInfo(int(row["metric_id"]), row["metric"], row["unit"], row["statement"])
+        catalog[catalog_key(info.metric)] = info
+    return catalog, hashlib.sha256(raw).hexdigest()
+
+METRIC_CATALOG, METRIC_CATALOG_HASH = load_metric_catalog()
+
+# Metrics missing from the catalog: alternatives are tried in this order and the
+# first whose keywords occur anywhere in the name decides the unit
+UNIT_PATTERN = re.compile(
+    r"^(?:"
+    r"(?=.*(?:\bdays?\b|cycle))(?P<Days>)"
+    r"|(?=.*(?:ratio|coverage|turnover|p/e|p/b|ev/ebitda|debt to equity|price to))(?P<Ratio>)"
+    r"|(?=.*(?:%|margin|\broe\b|\broce\b|\broa\b|return on|yield|payout|growth|cagr))(?P<Percentage>)"
+    r"|(?=.*(?:\beps\b|dividend|book value|face value|price))(?P<INR>)"
+    r"|(?=.*(?:sales|revenue|profit|income|expense|asset|liabilit|equity|cash|borrowing|investment"
+    r"|market cap|reserves|deposit|interest|depreciation|cwip))(?P<INR_Crores>)"
+    r")"
+)
+
+def metric_info(metric_name: str) -> Optional[MetricInfo]:
+    return METRIC_CATALOG.get(catalog_key(metric_name))
+
+@lru_cache(maxsize=4096)
 def infer_unit(metric_name: str, statement: str) -> str:
-    metric_lower = clean_metric_name(metric_name).lower()
-    if any(word in metric_lower for word in ["sales","revenue","profit","income","expense","asset","liability","equity","cash","borrowing","investment","market cap","reserves","fixed assets","current assets","total assets","total liabilities"]):
-        return "INR Crores"
-    if any(word in metric_lower for word in ["eps","dividend","book value","face value"]):
-        return "INR"
-    if any(word in metric_lower for word in ["margin","roe","roce","roa","ratio","yield","coverage","payout","growth","tax %","opm %"]):
-        return "Percentage"
-    if any(word in metric_lower for word in ["debt to equity","current ratio","quick ratio","p/e","p/b","ev/ebitda","interest coverage"]):
-        return "Ratio"
-    if any(word in metric_lower for word in ["days","turnover","cycle","debtor days","inventory days","working capital days"]):
-        return "Days"
-    if any(word in metric_lower for word in ["price","current price"]):
-        return "INR"
+    info = metric_info(metric_name)
+    if info:
+        return info.unit
+    match = UNIT_PATTERN.match(catalog_key(metric_name))
+    if match and match.lastgroup:
+        return match.lastgroup.replace("_", " ")
     return "Number"
 
 # ==================== DATA NORMALIZATION ====================
-def create_normalized_rows(company_name: str, symbol: str, tables: Dict) -> List[Dict]:
-    rows = []
-    all_years = ["2019","2020","2021","2022","2023","2024","2025"]
-    for statement_name, sections in tables.items():
-        for section_name, metrics in sections.items():
-            for metric_name, year_values in metrics.items():
-                for year in all_years:
-                    value = year_values.get(year,"")
-                    if value:
-                        rows.append({
-                            "Company": company_name,
-                            "Symbol": symbol,
-                            "Statement": statement_name,
-                            "Section": section_name,
-                            "Metric": clean_metric_name(metric_name),
-                            "Year": int(year),
-                            "Value": value,
-                            "Unit": infer_unit(metric_name, statement_name),
-                            "Source": Config.SOURCE
-                        })
-    return rows
+NORMALIZED_SCHEMA = ["Company","Symbol","Statement","Section","Metric","Year","Value","Unit","Source"]
+
+def create_normalized_columns(company_name: str, symbol: str, tables: Dict) -> Dict[str, List]:
+    """Long-format columns for one company: one entry per non-empty (metric, year) cell.
+
+    Metric name and unit are worked out once per metric, and the years are the
+    ones present in the parsed table rather than a fixed list.
+    """
+    statements, sections, metrics, units, years, values = [], [], [], [], [], []
+    for statement_name, statement_sections in tables.items():
+        for section_name, metric_values in statement_sections.items():
+            for metric_name, year_values in metric_values.items():
+                filled = [(year, value) for year, value in year_values.items() if value]
+                if not filled:
+                    continue
+                n = len(filled)
+                statements += [statement_name] * n
+                sections += [section_name] * n
+                metrics += [clean_metric_name(metric_name)] * n
+                units += [infer_unit(metric_name, statement_name)] * n
+                for year, value in filled:
+                    years.append(int(year))
+                    values.append(value)
+    n = len(values)
+    return {
+        "Company": [company_name] * n,
+        "Symbol": [symbol] * n,
+        "Statement": statements,
+        "Section": sections,
+        "Metric": metrics,
+        "Year": years,
+        "Value": values,
+        "Unit": units,
+        "Source": [Config.SOURCE] * n,
+    }
+
+def normalized_frame(companies: List[Dict[str, List]]) -> pd.DataFrame:
+    """Stack per-company columns into one long-format DataFrame without per-row dicts."""
+    return pd.DataFrame({
+        col: list(chain.from_iterable(columns[col] for columns in companies))
+        for col in NORMALIZED_SCHEMA
+    })
+
+def parse_and_normalize(page: bytes, symbol: str) -> Tuple[str, Dict, Dict[str, List]]:
+    """Company name, tables and normalized columns for a page, reused when the body is unchanged."""
+    key = content_key(page, symbol, Config.PARSE_VERSION, Config.MAX_YEARS, Config.SOURCE,
+                      METRIC_CATALOG_HASH)
+    cached = parsed_results.get(key)
+    if cached is not None:
+        return cached["company_name"], cached["tables"], cached["columns"]
+
+    company_name, tables = parse_screener_page(page, symbol)
+    columns = create_normalized_columns(company_name, symbol, tables)
+    parsed_results.put(key, {"company_name": company_name, "tables": tables, "columns": columns})
+    return company_name, tables, columns
 
 # ==================== CSV EXPORT ====================
-def export_to_csv(rows: List[Dict], filename: str) -> None:
-    if not rows:
+def export_to_csv(df: pd.DataFrame, filename: str) -> None:
+    if df.empty:
         print("⚠ No data to export")
         return
-    schema = ["Company","Symbol","Statement","Section","Metric","Year","Value","Unit","Source"]
-    df = pd.DataFrame(rows)
-    for col in schema:
-        if col not in df.columns:
-            df[col] = ""
-    df = df[schema].sort_values(["Company","Statement","Section","Metric","Year"])
+    df = df[NORMALIZED_SCHEMA].sort_values(["Company","Statement","Section","Metric","Year"])
     df.to_csv(filename, index=False)
-    print(f"✅ Exported {len(rows)} records to {filename}")
+    print(f"✅ Exported {len(df)} records to {filename}")
+
+# ==================== BATCH RESOLUTION ====================
+def batch_key(company_name: str) -> str:
+    """Dedup key: spellings that differ only in case, spacing, punctuation or a legal suffix collapse."""
+    return symbols.normalize_name(normalize_company_name(company_name))
+
+async def resolve_many_async(limiter: aio.HostLimiter, company_inputs: List[str]) -> Tuple[List[str], Dict[str, int]]:
+    """Resolve every unique name once; returns one symbol per input (in order) and lookup stats."""
+    first_spelling: Dict[str, str] = {}
+    for company_input in company_inputs:
+        first_spelling.setdefault(batch_key(company_input), normalize_company_name(company_input))
+
+    resolved: Dict[str, str] = {}
+    pending = []
+    for key, name in first_spelling.items():
+        symbol = offline_symbol(name) or offline_symbol(key) or cached_symbol(name)
+        if symbol:
+            resolved[key] = symbol
+        else:
+            pending.append(key)
+
+    # only names nobody has resolved before go to the network, all at once
+    found = await asyncio.gather(*(resolve_nse_symbol_async(limiter, first_spelling[k]) for k in pending))
+    resolved.update(zip(pending, found))
+
+    keys = [batch_key(c) for c in company_inputs]
+    pending_set = set(pending)
+    stats = {
+        "inputs": len(company_inputs),
+        "unique": len(first_spelling),
+        "offline": len(first_spelling) - len(pending),
+        "network": len(pending),
+        "avoided": sum(1 for k in keys if k in pending_set) - len(pending),
+    }
+    return [resolved[k] for k in keys], stats
+
+def resolve_many(company_inputs: List[str]) -> Tuple[List[str], Dict[str, int]]:
+    """Blocking wrapper around resolve_many_async."""
+    limiter = aio.HostLimiter(Config.HOST_CONCURRENCY)
+    return aio.run(resolve_many_async(limiter, company_inputs), max_workers=sum(Config.HOST_CONCURRENCY.values()))
+
+def print_resolution_stats(stats: Dict[str, int]) -> None:
+    print(f"🔍 Resolved {stats['inputs']} inputs as {stats['unique']} unique names "
+          f"({stats['offline']} offline/cached, {stats['network']} via search, "
+          f"{stats['avoided']} duplicate network lookups avoided)")
+
+# ==================== COMPANY PROCESSING ====================
+def collect_company_rows(company_inputs: List[str]) -> pd.DataFrame:
+    """Resolve all names in one batch, then fetch and normalize companies one at a time."""
+    symbols_found, stats = resolve_many(company_inputs)
+    print_resolution_stats(stats)
+    companies = []
+    for company_input, symbol in zip(company_inputs, symbols_found):
+        print(f"\n📖 Input: {company_input}")
+        print(f"🔍 Symbol: {symbol}")
+        company_name, _, columns = parse_and_normalize(fetch_screener_page(symbol), symbol)
+        print(f"📈 Company: {company_name}")
+        print(f"📋 Records created: {len(columns['Value'])}")
+        companies.append(columns)
+    return normalized_frame(companies)
+
+# ==================== ASYNC PIPELINE ====================
+async def search_symbol_async(limiter: aio.HostLimiter, source: str, query: str,
+                              ticket: Optional[ratelimit.Ticket] = None) -> str:
+    """Async counterpart of search_yahoo_symbol / search_screener_symbol."""
+    if source == "yahoo_search":
+        url, params, parse = YAHOO_SEARCH_URL, yahoo_search_params(query), parse_yahoo_search
+    else:
+        url, params, parse = SCREENER_SEARCH_URL, {"q": query}, parse_screener_search
+    r = await aio.fetch(limiter, url, lane=source, params=params, ticket=ticket)
+    r.raise_for_status()
+    return parse(r.json())
+
+async def resolve_nse_symbol_async(limiter: aio.HostLimiter, company_name: str) -> str:
+    """Same priority order as resolve_nse_symbol, with lookups capped per host."""
+    name = normalize_company_name(company_name)
+    symbol = offline_symbol(name) or cached_symbol(name)
+    if symbol:
+        return symbol
+
+    failures: List[str] = []
+
+    async def tagged(source: str, query: str, ticket: ratelimit.Ticket) -> Optional[Tuple[str, str]]:
+        try:
+            symbol = await search_symbol_async(limiter, source, query, ticket)
+        except ratelimit.Cancelled:
+            return None
+        except Exception:
+            failures.append(source)
+            return None
+        return (source, symbol) if symbol else None
+
+    found = await aio.first_in_priority(
+        [partial(tagged, source, query) for source, query in resolution_plan(name)],
+        Config.RESOLVE_STAGGER,
+    )
+    return remember_symbol(name, found, complete=not failures)
+
+async def fetch_screener_page_async(limiter: aio.HostLimiter, symbol: str) -> bytes:
+    try:
+        response = await aio.fetch(limiter, company_url(symbol), lane="screener_page")
+        response.raise_for_status()
+    except Exception as e:
+        raise ValueError(f"Failed to fetch Screener data for {symbol}: {e}")
+    return response.content
+
+async def collect_company_rows_async(company_inputs: List[str]) -> pd.DataFrame:
+    """Resolve in one batch, then fetch and normalize many companies concurrently; rows keep input order."""
+    limiter = aio.HostLimiter(Config.HOST_CONCURRENCY)
+    in_flight = asyncio.Semaphore(Config.MAX_COMPANIES_IN_FLIGHT)
+    symbols_found, stats = await resolve_many_async(limiter, company_inputs)
+    print_resolution_stats(stats)
+
+    async def process(company_input: str, symbol: str) -> Dict[str, List]:
+        async with in_flight:
+            page = await fetch_screener_page_async(limiter, symbol)
+            company_name, _, columns = await asyncio.to_thread(parse_and_normalize, page, symbol)
+            print(f"📖 {company_input} → 🔍 {symbol} → 📈 {company_name} ({len(columns['Value'])} records)")
+            return columns
+
+    results = await asyncio.gather(*(process(c, s) for c, s in zip(company_inputs, symbols_found)))
+    return normalized_frame(results)
+
+# ==================== REPARSE FROM ARCHIVE ====================
+def reparse_archived_page(page: Tuple[str, str]) -> Dict[str, List]:
+    """Columns for one archived (symbol, sha256) page; runs in a worker process."""
+    symbol, sha = page
+    company_name, tables = parse_screener_page(archive.load(sha), symbol)
+    return create_normalized_columns(company_name, symbol, tables)
+
+def collect_archived_rows() -> Tuple[List[str], pd.DataFrame]:
+    """Rebuild rows for every archived company page on all cores, without any network."""
+    pages = archived_company_pages()
+    with ProcessPoolExecutor() as pool:
+        results = pool.map(reparse_archived_page, pages, chunksize=8)
+        all_rows = normalized_frame(list(results))
+    return [symbol for symbol, _ in pages], all_rows
 
 # ==================== MAIN PIPELINE ====================
-def run_financial_pipeline():
+def run_financial_pipeline(async_mode: bool = False, reparse: bool = False):
     start_time = datetime.now()
     print("🎯 PRODUCTION-GRADE FINANCIAL DATA PIPELINE")
     print("="*60)
     try:
-        company_inputs = get_company_input()
-        all_rows = []
-        for company_input in company_inputs:
-            print(f"\n📖 Input: {company_input}")
-            symbol = resolve_nse_symbol(company_input)
-            print(f"🔍 Symbol: {symbol}")
-            company_name, tables = fetch_screener_data(symbol)
-            print(f"📈 Company: {company_name}")
-            rows = create_normalized_rows(company_name, symbol, tables)
-            print(f"📋 Records created: {len(rows)}")
-            all_rows.extend(rows)
+        if not reparse:
+            resolutions.purge_expired()
+        if reparse:
+            company_inputs, all_rows = collect_archived_rows()
+        elif async_mode:
+            company_inputs = get_company_input()
+            all_rows = aio.run(
+                collect_company_rows_async(company_inputs),
+                max_workers=sum(Config.HOST_CONCURRENCY.values()) + (os.cpu_count() or 1),
+            )
+        else:
+            company_inputs = get_company_input()
+            all_rows = collect_company_rows(company_inputs)
         export_to_csv(all_rows, Config.OUTPUT_FILE)
         duration = (datetime.now() - start_time).total_seconds()
         print(f"\n📊 PIPELINE SUMMARY:")
@@ -269,5 +542,10 @@ def run_financial_pipeline():
 
 # ==================== EXECUTION ====================
 if __name__ == "__main__":
-    success = run_financial_pipeline()
+    async_mode = "--async" in sys.argv
+    reparse = "--reparse" in sys.argv
+    if "--refresh" in sys.argv:
+        HttpConfig.CACHE_FORCE_REFRESH = True
+    sys.argv = [a for a in sys.argv if a not in ("--async", "--refresh", "--reparse")]
+    success = run_financial_pipeline(async_mode=async_mode, reparse=reparse)
     sys.exit(0 if success else 1)
@@ -0,0 +1,89 @@
+"""Shared scenarios for the sync and async ``first_in_priority``::
+
+    python -m unittest discover tests
+"""
+import asyncio
+import os
+import sys
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import aio, fanout
+
+STAGGER = 0.3
+
+
+def run_sync(specs, started):
+    """Each spec is ``(delay, result)``; start times are appended to ``started``."""
+    t0 = time.monotonic()
+
+    def make(name, delay, result):
+        def call(ticket):
+            started.append((name, time.monotonic() - t0))
+            ticket.sent.set()
+            time.sleep(delay)
+            return result
+        return call
+
+    calls = [make(chr(97 + n), *spec) for n, spec in enumerate(specs)]
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        return fanout.first_in_priority(calls, executor, STAGGER), time.monotonic() - t0
+
+
+def run_async(specs, started):
+    t0 = time.monotonic()
+
+    def make(name, delay, result):
+        async def call(ticket):
+            started.append((name, time.monotonic() - t0))
+            ticket.sent.set()
+            await asyncio.sleep(delay)
+            return result
+        return call
+
+    calls = [make(chr(97 + n), *spec) for n, spec in enumerate(specs)]
+    return asyncio.run(aio.first_in_priority(calls, STAGGER)), time.monotonic() - t0
+
+
+class FirstInPriorityTest(unittest.TestCase):
+    def check(self, specs):
+        """Run ``specs`` through both implementations; both must start the same calls."""
+        runs = []
+        for runner in (run_sync, run_async):
+            started = []
+            result, elapsed = runner(specs, started)
+            runs.append((result, dict(started), elapsed))
+        self.assertEqual(runs[0][0], runs[1][0])
+        self.assertEqual(sorted(runs[0][1]), sorted(runs[1][1]))
+        return runs
+
+    def test_fast_hit_sends_one_request(self):
+        for result, started, _ in self.check([(0.05, "a"), (0.05, "b"), (0.05, "c")]):
+            self.assertEqual(result, "a")
+            self.assertEqual(list(started), ["a"])
+
+    def test_miss_starts_next_immediately(self):
+        for result, started, elapsed in self.check([(0.05, None), (0.05, None), (0.05, "c")]):
+            self.assertEqual(result, "c")
+            self.assertLess(started["c"], STAGGER)
+            self.assertLess(elapsed, STAGGER)
+
+    def test_slow_call_keeps_hedging_every_stagger(self):
+        specs = [(2.0, None), (0.05, None), (0.05, None), (0.05, "d")]
+        for result, started, elapsed in self.check(specs):
+            self.assertEqual(result, "d")
+            self.assertLess(started["c"], 3 * STAGGER)
+            self.assertLess(started["d"], 4 * STAGGER)
+            # the higher-priority call is still awaited before d can win
+            self.assertGreaterEqual(elapsed, 2.0)
+
+    def test_slow_hit_wins_over_later_hits(self):
+        for result, started, _ in self.check([(1.0, "a"), (0.05, "b")]):
+            self.assertEqual(result, "a")
+            self.assertIn("b", started)
+
+
+if __name__ == "__main__":
+    unittest.main()